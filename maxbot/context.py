@@ -3,6 +3,7 @@ import logging
 from collections.abc import MutableMapping
 from dataclasses import dataclass, field, fields
 from datetime import datetime, timezone
+from functools import cached_property
 from operator import attrgetter
 from types import SimpleNamespace
 from typing import Optional, Union
@@ -46,10 +47,30 @@ def _from_rich_repr(obj):
     )
 
 
+class _FrozenSlots:
+    """Support copying and pickling for frozen dataclasses with `__slots__`.
+
+    Slots are restored with `setattr` by default, which is not allowed for frozen dataclasses.
+    The `dataclass(slots=True)` solves this since Python 3.10, but we still support Python 3.9.
+    """
+
+    __slots__ = ()
+
+    def __getstate__(self):
+        return [getattr(self, f.name) for f in fields(self)]
+
+    def __setstate__(self, state):
+        for f, value in zip(fields(self), state):
+            object.__setattr__(self, f.name, value)
+
+
 @dataclass(frozen=True)
-class RecognizedIntent:
+class RecognizedIntent(_FrozenSlots):
     """An intent recognized from the user utterance."""
 
+    # A lot of intents are recognized, so save memory.
+    __slots__ = ("name", "confidence")
+
     # The name of the intent.
     name: str
 
@@ -131,9 +152,12 @@ class IntentsResult:
 
 
 @dataclass(frozen=True)
-class RecognizedEntity:
+class RecognizedEntity(_FrozenSlots):
     """An entity recognized from the user utterance."""
 
+    # A lot of entities are recognized, so save memory.
+    __slots__ = ("name", "value", "literal", "start_char", "end_char")
+
     # The name of the entity.
     name: str
 
@@ -173,7 +197,7 @@ class EntitiesProxy:
     # Entity definition
     definition: Optional[dict] = field(default=None)
 
-    @property
+    @cached_property
     def all_values(self):
         """Return a tuple of all entities values.
 
@@ -181,6 +205,16 @@ class EntitiesProxy:
         """
         return tuple(e.value for e in self.all_objects)
 
+    @cached_property
+    def _defined_values(self):
+        """Return names of the values from the entity definition.
+
+        :return frozenset:
+        """
+        if not self.definition:
+            return frozenset()
+        return frozenset(v["name"] for v in self.definition.get("values", []))
+
     @property
     def first(self):
         """Return the first recognized value.
@@ -218,7 +252,7 @@ class EntitiesProxy:
             return getattr(self.first, name)
         if name in self.all_values:
             return True
-        if self.definition and any(name == v["name"] for v in self.definition.get("values", [])):
+        if name in self._defined_values:
             # the value is defined but not recognized
             return False
         raise AttributeError
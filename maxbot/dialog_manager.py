@@ -33,6 +33,7 @@ class DialogManager:
         self.DialogSchema = dialog_schema or DialogSchema
         self.MessageSchema = message_schema or MessageSchema
         self.CommandSchema = command_schema or CommandSchema
+        self._schemas = {}
         self._nlu = nlu  # the default value is initialized lazily
         self.dialog_flow = dialog_flow or DialogFlow(context={"schema": self.CommandSchema})
         self.rpc = rpc or RpcManager()
@@ -52,6 +53,21 @@ class DialogManager:
             self._nlu = Nlu()
         return self._nlu
 
+    def _get_schema(self, schema_class, many=False):
+        """Get an instance of the schema class.
+
+        Creating marshmallow schemas is much more expensive than using them, so the instances are
+        cached instead of creating them for each turn.
+
+        :param type schema_class: A schema class.
+        :param bool many: Should the schema deserialize a list of objects.
+        :return Schema:
+        """
+        key = (schema_class, many)
+        if key not in self._schemas:
+            self._schemas[key] = schema_class(many=many)
+        return self._schemas[key]
+
     def load_resources(self, resources):
         """Load dialog resources.
 
@@ -86,8 +102,8 @@ class DialogManager:
             )
             return []
         logger.debug("process message %s, %s", message, dialog)
-        message = self.MessageSchema().load(message)
-        dialog = self.DialogSchema().load(dialog)
+        message = self._get_schema(self.MessageSchema).load(message)
+        dialog = self._get_schema(self.DialogSchema).load(dialog)
         utc_time = self.utc_time_provider()
         intents, entities = await self.nlu(message, utc_time=utc_time)
         ctx = TurnContext(
@@ -97,7 +113,7 @@ class DialogManager:
             message=message,
             intents=intents,
             entities=entities,
-            command_schema=self.CommandSchema(many=True),
+            command_schema=self._get_schema(self.CommandSchema, many=True),
         )
         await self.dialog_flow.turn(ctx)
         self._journal(ctx)
@@ -118,14 +134,14 @@ class DialogManager:
             )
             return []
         logger.debug("process rpc %s, %s", request, dialog)
-        dialog = self.DialogSchema().load(dialog)
+        dialog = self._get_schema(self.DialogSchema).load(dialog)
         request = self.rpc.parse_request(request)
         ctx = TurnContext(
             dialog,
             state,
             self.utc_time_provider(),
             rpc=RpcContext(RpcRequest(**request)),
-            command_schema=self.CommandSchema(many=True),
+            command_schema=self._get_schema(self.CommandSchema, many=True),
         )
         await self.dialog_flow.turn(ctx)
         self._journal(ctx)
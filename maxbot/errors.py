@@ -36,6 +36,20 @@ class BotError(RuntimeError):
         return "\n".join(lines)
 
 
+def yaml_document_key(mark):
+    """Get the key of the YAML-document that contains the mark.
+
+    Documents are identified by the file name or content string (for dynamic docs).
+
+    :param yaml.Mark mark: The mark of the YAML-node.
+    :return str:
+    """
+    if mark.buffer is None:
+        return mark.name
+    # the buffer of a string document is terminated with "\0" by the reader
+    return mark.buffer.rstrip("\0")
+
+
 class YamlSymbols:
     """Maps resource data fragments to the YAML nodes from which they were obtained.
 
@@ -50,6 +64,10 @@ class YamlSymbols:
 
     _stores = {}
 
+    # The buffer of the last seen document and its key, see :meth:`~_document_key`.
+    _last_buffer = None
+    _last_key = None
+
     @classmethod
     def cleanup(cls, document):
         """Remove YAML-nodes for the passed document.
@@ -57,6 +75,24 @@ class YamlSymbols:
         :param string document: The file name or content string of the YAML-document.
         """
         cls._stores.pop(document, None)
+        if document == cls._last_key:
+            cls._last_buffer, cls._last_key = None, None
+
+    @classmethod
+    def _document_key(cls, mark):
+        """Get the key of the document that contains the mark, see :func:`~yaml_document_key`.
+
+        All the marks of the document share the same buffer, so we avoid copying and hashing
+        the whole buffer for each node.
+
+        :param yaml.Mark mark: The mark of the YAML-node.
+        :return str:
+        """
+        if mark.buffer is None:
+            return yaml_document_key(mark)
+        if mark.buffer is not cls._last_buffer:
+            cls._last_buffer, cls._last_key = mark.buffer, yaml_document_key(mark)
+        return cls._last_key
 
     @classmethod
     def add(cls, data, node):
@@ -67,11 +103,7 @@ class YamlSymbols:
         """
         if isinstance(data, (int, float, bool)):
             return
-        if node.start_mark.buffer is not None:
-            key = node.start_mark.buffer.rstrip("\0")
-        else:
-            key = node.start_mark.name
-        store = cls._stores.setdefault(key, {})
+        store = cls._stores.setdefault(cls._document_key(node.start_mark), {})
         store[id(data)] = node
 
     @classmethod
@@ -252,7 +284,7 @@ class YamlSnippet(Snippet):
     @staticmethod
     def _read_lines(mark):
         if mark.buffer is not None:
-            code = mark.buffer.rstrip("\0")
+            code = yaml_document_key(mark)
         else:
             code = pathlib.Path(mark.name).read_text(encoding="utf8")
         # do not use splitlines, because terminal line break should result in an extra line
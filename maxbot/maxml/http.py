@@ -1,8 +1,33 @@
 """HTTPX library (https://www.python-httpx.org/) configuration."""
-import httpx
 from marshmallow import Schema, fields, post_load, pre_load  # noqa: F401
 
 
+class _HttpxDefault:
+    """A default httpx configuration object created on first access.
+
+    Importing httpx is expensive, so we do not import it until a configuration is needed.
+    """
+
+    def __init__(self, class_name, **kwargs):
+        """Create new class instance.
+
+        :param str class_name: The name of httpx class, e.g. "Timeout".
+        :param dict kwargs: Arguments of the class constructor.
+        """
+        self.class_name = class_name
+        self.kwargs = kwargs
+        self.value = None
+
+    def __get__(self, obj, objtype=None):
+        """Get the configuration object."""
+        if self.value is None:
+            # lazy import to speed up load time
+            import httpx
+
+            self.value = getattr(httpx, self.class_name)(**self.kwargs)
+        return self.value
+
+
 class TimeoutSchema(Schema):
     """HTTP request timeout schema.
 
@@ -39,6 +64,9 @@ class TimeoutSchema(Schema):
     @post_load
     def return_httpx_timeout(self, data, **kwargs):
         """Create and return httpx.Timeout by loaded data."""
+        # lazy import to speed up load time
+        import httpx
+
         return httpx.Timeout(
             connect=data.get("connect", data["default"]),
             read=data.get("read", data["default"]),
@@ -46,7 +74,7 @@ class TimeoutSchema(Schema):
             pool=data.get("pool", data["default"]),
         )
 
-    DEFAULT = httpx.Timeout(connect=5.0, read=5.0, write=5.0, pool=5.0)
+    DEFAULT = _HttpxDefault("Timeout", connect=5.0, read=5.0, write=5.0, pool=5.0)
 
 
 class PoolLimitSchema(Schema):
@@ -62,10 +90,15 @@ class PoolLimitSchema(Schema):
     @post_load
     def return_httpx_limits(self, data, **kwargs):
         """Create and return httpx.Timeout by loaded data."""
+        # lazy import to speed up load time
+        import httpx
+
         return httpx.Limits(
             max_keepalive_connections=data["max_keepalive_connections"],
             max_connections=data["max_connections"],
             keepalive_expiry=data["keepalive_expiry"],
         )
 
-    DEFAULT = httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=5.0)
+    DEFAULT = _HttpxDefault(
+        "Limits", max_keepalive_connections=20, max_connections=100, keepalive_expiry=5.0
+    )
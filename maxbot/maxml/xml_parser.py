@@ -3,6 +3,7 @@ import logging
 from dataclasses import dataclass
 from xml.sax.handler import ContentHandler, ErrorHandler  # nosec
 
+import marshmallow
 from defusedxml.sax import parseString
 
 from ..errors import BotError, XmlSnippet
@@ -17,6 +18,15 @@ KNOWN_ROOT_ELEMENTS = frozenset(
     + list(markup.PlainTextRenderer.KNOWN_END_TAGS.keys())
 )
 
+# Field classes parsed as a plain text, see :func:`~is_known_scalar`.
+_KNOWN_SCALARS = (
+    fields.String,
+    fields.Number,
+    fields.Boolean,
+    fields.DateTime,
+    fields.TimeDelta,
+)
+
 
 @dataclass(frozen=True)
 class Pointer:
@@ -83,6 +93,10 @@ class _ContentHandler(ContentHandler):
         return Pointer(lineno, self._locator.getColumnNumber())
 
     def register_symbol_factory(self):
+        if self.register_symbol is _skip_symbol:
+            # symbols are not collected, so do not capture pointers for them
+            return _skip_symbol
+
         captured_ptr = self._get_ptr()
 
         def _register_symbol(value):
@@ -126,12 +140,19 @@ class XmlParser:
             if command_schema.metadata.get("maxml", "element") != "element":
                 raise BotError(f"Command {command_name!r} is not described as an element")
 
+        if not document or document.isspace():
+            # nothing to parse, e.g. a template rendered to an empty string
+            return []
+
         # +1 lineno
         encoded = f"<{_ROOT_ELEM_NAME}>\n{document}</{_ROOT_ELEM_NAME}>".encode("utf-8")
 
-        def _register_symbol(value, ptr):
-            assert ptr.lineno >= 1
-            if maxml_symbols is not None:
+        if maxml_symbols is None:
+            _register_symbol = _skip_symbol
+        else:
+
+            def _register_symbol(value, ptr):
+                assert ptr.lineno >= 1
                 maxml_symbols[id(value)] = Pointer(ptr.lineno - 1, ptr.column)
 
         content_handler = self.CONTENT_HANDLER_CLASS(maxml_command_schema, _register_symbol)
@@ -185,19 +206,21 @@ class _ScalarElement(_ElementBase):
     def __init__(self, tag, register_symbol_factory, attrs):
         super().__init__(tag, register_symbol_factory)
         self.check_no_attr(attrs)
-        self.value = ""
+        # expat delivers text in chunks (lines, entities), join them once at the end
+        self.chunks = []
 
     def on_starttag(self, tag, attrs):
         _raise_not_described("Element", tag)
 
     def on_endtag(self, tag):
         assert tag == self.tag
-        self.register_symbol(self.value)
-        return self.value
+        value = "".join(self.chunks)
+        self.register_symbol(value)
+        return value
 
     def on_data(self, data):
         assert isinstance(data, str)
-        self.value += data
+        self.chunks.append(data)
 
 
 class _MarkupElement(_ElementBase):
@@ -206,15 +229,18 @@ class _MarkupElement(_ElementBase):
         self.check_no_attr(attrs)
         self.tag_level = 1
         self.items = []
+        self.text_chunks = []
 
     def on_starttag(self, tag, attrs):
         assert self.tag_level >= 1
         self.tag_level += 1
+        self._flush_text()
         self.items.append(markup.Item(markup.START_TAG, tag, dict(attrs) if attrs else None))
 
     def on_endtag(self, tag):
         assert self.tag_level >= 1
         self.tag_level -= 1
+        self._flush_text()
         if self.tag_level > 0:
             self.items.append(markup.Item(markup.END_TAG, tag))
             return None
@@ -226,10 +252,13 @@ class _MarkupElement(_ElementBase):
 
     def on_data(self, data):
         assert isinstance(data, str)
-        if self.items and self.items[-1].kind == markup.TEXT:
-            self.items[-1] = markup.Item(markup.TEXT, self.items[-1].value + data)
-        else:
-            self.items.append(markup.Item(markup.TEXT, data))
+        # adjacent chunks are merged into a single TEXT item, see :meth:`_flush_text`
+        self.text_chunks.append(data)
+
+    def _flush_text(self):
+        if self.text_chunks:
+            self.items.append(markup.Item(markup.TEXT, "".join(self.text_chunks)))
+            self.text_chunks = []
 
 
 class _DictElement(_ElementBase):
@@ -296,7 +325,9 @@ class _ListElement(_ElementBase):
 class _ContentElement(_ElementBase):
     def __init__(self, tag, register_symbol_factory, attrs, schema, field_name, field_schema):
         child_elements = [
-            f for f in schema().declared_fields.items() if f[1].metadata.get("maxml") == "element"
+            f
+            for f in _get_declared_fields(schema).items()
+            if f[1].metadata.get("maxml") == "element"
         ]
         if child_elements:
             child_names = ", ".join(repr(i[0]) for i in child_elements)
@@ -397,7 +428,7 @@ def _factory(tag, register_symbol_factory, attrs, schema, parent=None):
             )
         content_fields = [
             f
-            for f in schema.nested().declared_fields.items()
+            for f in _get_declared_fields(schema.nested).items()
             if f[1].metadata.get("maxml") == "content"
         ]
         if len(content_fields) > 1:
@@ -413,12 +444,42 @@ def _factory(tag, register_symbol_factory, attrs, schema, parent=None):
     raise _Error(f"Unexpected schema ({type(schema)}) for element {tag!r}")
 
 
+def _skip_symbol(value, ptr=None):
+    # used when the caller does not collect symbols
+    pass
+
+
 def _raise_not_described(entity, name):
     raise _Error(f"{entity} {name!r} is not described in the schema")
 
 
+def _get_declared_fields(schema):
+    """Get declared fields of the schema class.
+
+    Creating a schema instance deep copies all its fields. Schema classes hold the fields in
+    a class attribute, so we read it when the class does not customize its fields in
+    `__init__`. Otherwise, and for other callables, e.g. a lambda passed to
+    :class:`~fields.Nested`, we create an instance only once and cache its fields on the
+    callable itself, so the cache does not outlive it.
+
+    :param type|callable schema: The schema class or a callable returning a schema instance.
+    :return dict: Declared fields by name.
+    """
+    if isinstance(schema, type) and schema.__init__ is marshmallow.Schema.__init__:
+        return schema._declared_fields
+    # look in the own namespace only, subclasses must not get the fields of their parent
+    declared_fields = getattr(schema, "__dict__", {}).get("_maxml_declared_fields")
+    if declared_fields is None:
+        declared_fields = schema().declared_fields
+        try:
+            schema._maxml_declared_fields = declared_fields
+        except AttributeError:
+            pass  # can not cache, e.g. a bound method
+    return declared_fields
+
+
 def _get_object_field_schema(schema, field_name, entity):
-    field_schema = schema().declared_fields.get(field_name)
+    field_schema = _get_declared_fields(schema).get(field_name)
     if field_schema is None:
         _raise_not_described(entity, field_name)
     return field_schema
@@ -430,17 +491,7 @@ def _normalize_spaces(s):
 
 def is_known_scalar(schema):
     """Check for known scalar field (or inherited)."""
-    if isinstance(schema, fields.String):
-        return True
-    if isinstance(schema, fields.Number):
-        return True
-    if isinstance(schema, fields.Boolean):
-        return True
-    if isinstance(schema, fields.DateTime):
-        return True
-    if isinstance(schema, fields.TimeDelta):
-        return True
-    return False
+    return isinstance(schema, _KNOWN_SCALARS)
 
 
 def get_metadata_maxml(schema):
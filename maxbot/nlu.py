@@ -2,8 +2,9 @@
 import logging
 import re
 import warnings
-from functools import cached_property
-from itertools import chain
+from collections import Counter
+from functools import cached_property, lru_cache
+from itertools import chain, islice
 from operator import attrgetter
 
 from .context import EntitiesResult, IntentsResult, RecognizedEntity, RecognizedIntent
@@ -133,6 +134,7 @@ class SimilarityRecognizer:
         """
         self.spacy_nlp = spacy_nlp
         self.examples, self.labels = [], []
+        self._index = None
         self.threshold = threshold or self.default_threshold
 
     @cached_property
@@ -140,6 +142,9 @@ class SimilarityRecognizer:
         """Return an algorithm that calculates similarity.
 
         See https://pypi.org/project/textdistance/.
+
+        The default cosine similarity is calculated with an index of examples, see
+        :meth:`~_scores`. The algorithm is called directly only when it is overridden.
         """
         import textdistance
 
@@ -154,11 +159,55 @@ class SimilarityRecognizer:
         for intent in intents:
             self.examples.extend([self.spacy_nlp.make_doc(e) for e in intent["examples"]])
             self.labels.extend([intent["name"]] * len(intent["examples"]))
+        self._get_index()
         logger.debug("%s similarity based intents loaded", len(intents))
 
     def _preprocess(self, doc):
         return [t.lower_ for t in doc]
 
+    def _get_index(self):
+        """Get examples indexed by token.
+
+        Examples are tokenized once, so that only the examples sharing at least one token with
+        the user input are scored. The list of examples is mutable, so the index is rebuilt
+        when it changes.
+
+        :return tuple[list[int], dict]: Numbers of tokens in examples and a list of example
+            indexes with token counts by token.
+        """
+        examples = tuple(self.examples)
+        if self._index is None or self._index[0] != examples:
+            lengths, postings = [], {}
+            for i, example in enumerate(examples):
+                tokens = self._preprocess(example)
+                lengths.append(len(tokens))
+                for token, count in Counter(tokens).items():
+                    postings.setdefault(token, []).append((i, count))
+            self._index = examples, lengths, postings
+        return self._index[1:]
+
+    def _scores(self, tokens):
+        """Calculate cosine similarity of the tokens to each example.
+
+        Tokens are treated as multisets, the same way as `textdistance.cosine` does.
+        Examples without common tokens are omitted.
+
+        :param list[str] tokens: Preprocessed user input.
+        :return dict[int, float]: Similarity scores by example index.
+        """
+        lengths, postings = self._get_index()
+        if not tokens:
+            # empty sequences are identical
+            return {i: 1 for i, length in enumerate(lengths) if length == 0}
+        intersections = {}
+        for token, count in Counter(tokens).items():
+            for i, example_count in postings.get(token, ()):
+                intersections[i] = intersections.get(i, 0) + min(count, example_count)
+        return {
+            i: intersection / pow(len(tokens) * lengths[i], 0.5)
+            for i, intersection in sorted(intersections.items())
+        }
+
     def __call__(self, doc):
         """Recognize intents.
 
@@ -166,13 +215,25 @@ class SimilarityRecognizer:
         :return List[RecognizedIntent]: A list of recognized intents.
         """
         tokens = self._preprocess(doc)
-        scores = [self.similarity(tokens, self._preprocess(example)) for example in self.examples]
+        if (
+            type(self).similarity is SimilarityRecognizer.similarity
+            and "similarity" not in self.__dict__
+        ):
+            scores = self._scores(tokens)
+        else:
+            scores = {
+                i: self.similarity(tokens, self._preprocess(example))
+                for i, example in enumerate(self.examples)
+            }
 
         max_scores = {}
-        for score, label, example in zip(scores, self.labels, self.examples):
+        for i, score in scores.items():
+            label = self.labels[i]
             if score > max_scores.get(label, self.threshold):
                 max_scores[label] = score
-                logger.debug("label '%s' score %s example '%s'", label, score, example.text)
+                logger.debug(
+                    "label '%s' score %s example '%s'", label, score, self.examples[i].text
+                )
 
         result = []
         for label, score in max_scores.items():
@@ -206,13 +267,15 @@ class PhraseEntities:
         from spacy.matcher import PhraseMatcher
 
         self._matcher = PhraseMatcher(self.spacy_nlp.vocab, attr="LOWER")
-        for entity in entities:
-            for value in entity["values"]:
-                key = f"{entity['name']}-{value['name']}"
-                match_id = self.spacy_nlp.vocab.strings.add(key)
-                self.ids[match_id] = (entity["name"], value["name"])
-                patterns = list(self.spacy_nlp.pipe(value["phrases"]))
-                self._matcher.add(key, patterns)
+        # matching on the LOWER attribute only needs tokenization, so all phrases
+        # are tokenized in one batch without running the pipeline components
+        values = [(e["name"], v) for e in entities for v in e["values"]]
+        patterns = self.spacy_nlp.tokenizer.pipe(p for _, v in values for p in v["phrases"])
+        for entity_name, value in values:
+            key = f"{entity_name}-{value['name']}"
+            match_id = self.spacy_nlp.vocab.strings.add(key)
+            self.ids[match_id] = (entity_name, value["name"])
+            self._matcher.add(key, list(islice(patterns, len(value["phrases"]))))
         logger.debug("%s phrase entities loaded", len([e for e in entities if e["values"]]))
 
     def __call__(self, doc, utc_time=None):
@@ -262,15 +325,17 @@ class RegexpEntities:
         :param datetime utc_time: Date and time of dialog turn.
         :return Iterable[RecognizedEntity]: Recognized regexps entities.
         """
+        # Doc.text joins all the tokens on each access, so read it only once
+        text = doc.text
         for p in self.regexps:
-            for match in re.finditer(p["pattern"], doc.text):
+            for match in p["pattern"].finditer(text):
                 start, end = match.span()
                 if start == end:
                     continue
                 yield RecognizedEntity(
                     name=p["label"],
                     value=p["id"],
-                    literal=doc.text[start:end],
+                    literal=text[start:end],
                     start_char=start,
                     end_char=end,
                 )
@@ -297,14 +362,11 @@ class SpacyMatcherEntities:
 
     @cached_property
     def matcher(self):
-        """Spacy matcher."""
-        from spacy.matcher import Matcher
+        """Spacy matcher.
 
-        matcher = Matcher(self.spacy_nlp.vocab)
-        matcher.add("number", [[{"LIKE_NUM": True, "OP": "+"}]], greedy="LONGEST")
-        matcher.add("email", [[{"LIKE_EMAIL": True}]])
-        matcher.add("url", [[{"LIKE_URL": True}]])
-        return matcher
+        The matcher is shared between instances created with the same vocabulary.
+        """
+        return _build_builtin_matcher(self.spacy_nlp.vocab)
 
     def __call__(self, doc, utc_time=None):
         """Recognize entities in the given `doc`.
@@ -325,17 +387,42 @@ class SpacyMatcherEntities:
                 yield RecognizedEntity.from_span(span)
 
     def _parse_number(self, text):
-        import babel.numbers
-        import number_parser
+        return _parse_number(text)
+
+
+# a few vocabularies are used in practice, the bound prevents keeping the dropped ones forever
+@lru_cache(maxsize=8)
+def _build_builtin_matcher(vocab):
+    from spacy.matcher import Matcher
 
-        # try to parse numeric data in a locale-sensitive manner
-        for parser in (babel.numbers.parse_number, babel.numbers.parse_decimal):
-            try:
-                return parser(text, locale="en_US")
-            except babel.numbers.NumberFormatError:
-                pass
-        # try to parse number written in words to an integer
-        return number_parser.parse_number(text, language="en")
+    matcher = Matcher(vocab)
+    matcher.add("number", [[{"LIKE_NUM": True, "OP": "+"}]], greedy="LONGEST")
+    matcher.add("email", [[{"LIKE_EMAIL": True}]])
+    matcher.add("url", [[{"LIKE_URL": True}]])
+    return matcher
+
+
+@lru_cache(maxsize=4096)
+def _parse_number(text):
+    """Parse the text of a number span.
+
+    Numbers written in words fall through both babel parsers, each of them failing with
+    an exception, so results are memoized: the same phrases tend to come up again.
+
+    :param str text: The text of the span matched as number.
+    :return int|Decimal|None:
+    """
+    import babel.numbers
+    import number_parser
+
+    # try to parse numeric data in a locale-sensitive manner
+    for parser in (babel.numbers.parse_number, babel.numbers.parse_decimal):
+        try:
+            return parser(text, locale="en_US")
+        except babel.numbers.NumberFormatError:
+            pass
+    # try to parse number written in words to an integer
+    return number_parser.parse_number(text, language="en")
 
 
 class DateParserEntities:
@@ -352,8 +439,24 @@ class DateParserEntities:
         {"name": "time"},
     ]
 
+    # Date data parser used to split date and time parts, the shared one is used by default.
     ddp = None
 
+    # Date data parsers are expensive to create, so they are shared between instances.
+    _shared_parsers = None
+
+    @classmethod
+    def _get_shared_parsers(cls):
+        from dateparser.date import DateDataParser
+
+        if cls._shared_parsers is None:
+            # language autodetection slows down the parser, provide language explicitly
+            cls._shared_parsers = (
+                DateDataParser(languages=["en"], settings={"RETURN_TIME_AS_PERIOD": True}),
+                DateDataParser(languages=["en"], settings={"REQUIRE_PARTS": ["day"]}),
+            )
+        return cls._shared_parsers
+
     def __call__(self, doc, utc_time=None):
         """Recognize entities in the given `doc`.
 
@@ -361,13 +464,11 @@ class DateParserEntities:
         :param datetime utc_time: Date and time of dialog turn.
         :return Iterable[RecognizedEntity]: Recognized entities.
         """
-        from dateparser import parse
-        from dateparser.date import DateDataParser
         from dateparser.search import search_dates
 
+        period_ddp, day_ddp = self._get_shared_parsers()
         if self.ddp is None:
-            # language autodetection slows down the parser, provide language explicitly
-            self.ddp = DateDataParser(languages=["en"], settings={"RETURN_TIME_AS_PERIOD": True})
+            self.ddp = period_ddp
 
         # suppress known PytzUsageWarning from dateparser
         with warnings.catch_warnings():
@@ -391,7 +492,7 @@ class DateParserEntities:
                 # a bit tricky way to split date and time parts
                 dd = self.ddp.get_date_data(literal)
                 if dd.period == "time":
-                    if parse(literal, languages=["en"], settings={"REQUIRE_PARTS": ["day"]}):
+                    if day_ddp.get_date_data(literal).date_obj:
                         name = "date" if settings.get("STRICT_PARSING") else "latent_date"
                         yield RecognizedEntity(
                             name, dt.date().isoformat(), literal, start_char, end_char
@@ -468,6 +569,8 @@ class Nlu:
         self._entity_recognizers = None
         self._intent_definitinos = None
         self._entity_definitions = None
+        self._resolved_intent_definitions = None
+        self._resolved_entity_definitions = None
 
     # By default we use shared nlp which improves the performance of tests.
     _shared_spacy_nlp = None
@@ -535,12 +638,16 @@ class Nlu:
     @entity_recognizers.setter
     def entity_recognizers(self, value):
         self._entity_recognizers = value
+        self._resolved_entity_definitions = None
 
     def load_resources(self, resources):
         """Load dialog resources.
 
         :param Resources resources: Bot resources.
         """
+        self._resolved_intent_definitions = None
+        self._resolved_entity_definitions = None
+
         self._intent_definitinos = resources.load_intents(IntentSchema(many=True))
         if self._intent_definitinos:
             self.intent_recognizer.load(self._intent_definitinos)
@@ -589,21 +696,33 @@ class Nlu:
     def resolve_intent_definitions(self):
         """Resolve intent definitions for intents result.
 
+        The result is cached until resources are reloaded.
+
         :return dict:
         """
-        if self._intent_definitinos is not None:
-            return {d["name"]: d for d in self._intent_definitinos}
-        return None
+        if self._intent_definitinos is None:
+            return None
+        if self._resolved_intent_definitions is None:
+            self._resolved_intent_definitions = {d["name"]: d for d in self._intent_definitinos}
+        return self._resolved_intent_definitions
 
     def resolve_entity_definitions(self):
         """Resolve entity definitions for entities result.
 
+        The result is cached until resources are reloaded or entity recognizers are changed.
+
         :return dict:
         """
-        rv = {}
-        if self._entity_definitions is not None:
-            rv.update({d["name"]: d for d in self._entity_definitions})
-        for recognizer in self.entity_recognizers:
-            if hasattr(recognizer, "builtin_definitions"):
-                rv.update({d["name"]: d for d in recognizer.builtin_definitions})
-        return rv
+        # the list of recognizers is mutable, so it is a part of the cache key
+        recognizers = tuple(self.entity_recognizers)
+        if self._resolved_entity_definitions is None or (
+            self._resolved_entity_definitions[0] != recognizers
+        ):
+            rv = {}
+            if self._entity_definitions is not None:
+                rv.update({d["name"]: d for d in self._entity_definitions})
+            for recognizer in recognizers:
+                if hasattr(recognizer, "builtin_definitions"):
+                    rv.update({d["name"]: d for d in recognizer.builtin_definitions})
+            self._resolved_entity_definitions = recognizers, rv
+        return self._resolved_entity_definitions[1]
@@ -15,10 +15,11 @@ from sqlalchemy import (
     Integer,
     String,
     UniqueConstraint,
+    bindparam,
     create_engine,
     select,
 )
-from sqlalchemy.orm import Session, declarative_base, relationship
+from sqlalchemy.orm import Session, declarative_base, object_session, relationship
 from sqlalchemy.pool import StaticPool
 
 from .context import StateVariables
@@ -46,7 +47,8 @@ def create_json_serializer(default_serializers=None):
                 return serializer(o)
         raise TypeError(f"Object of type {o.__class__.__name__} is not JSON serializable")
 
-    return lambda o: json.dumps(o, default=_default)
+    # json.dumps creates a new encoder on each call with custom arguments, so reuse one
+    return json.JSONEncoder(default=_default).encode
 
 
 class DialogTable(Base):
@@ -67,6 +69,7 @@ class DialogTable(Base):
 
     history = relationship(
         lambda: HistoryTable,
+        back_populates="dialog",
         cascade="all, delete-orphan",
         order_by=lambda: HistoryTable.history_id,
     )
@@ -109,6 +112,18 @@ class HistoryTable(Base):
     request = Column(JSON, nullable=False)
     response = Column(JSON, nullable=False)
 
+    dialog = relationship(DialogTable, back_populates="history")
+
+
+# Select the dialog of the current turn. The statement is built once, building and caching it
+# for each turn is much more expensive than executing.
+SELECT_DIALOG = (
+    select(DialogTable)
+    .where(DialogTable.channel_name == bindparam("channel_name"))
+    .where(DialogTable.user_id == bindparam("user_id"))
+    .with_for_update()
+)
+
 
 class PersistenceTracker:
     """Dialog turn persistence tracker."""
@@ -135,14 +150,7 @@ class PersistenceTracker:
         :param any message: JSON-serializable object of user message.
         :param list commands: List of JSON-serializable objects of response commands.
         """
-        self.user.history.append(
-            HistoryTable(
-                request_date=datetime.now(timezone.utc),
-                request_type=RequestType.message,
-                request=message,
-                response=commands,
-            )
-        )
+        self._add_history(RequestType.message, message, commands)
 
     def set_rpc_history(self, rpc, commands):
         """Track RPC.
@@ -150,12 +158,18 @@ class PersistenceTracker:
         :param any rpc: JSON-serializable object of RPC.
         :param list commands: List of JSON-serializable objects of response commands.
         """
-        self.user.history.append(
+        self._add_history(RequestType.rpc, rpc, commands)
+
+    def _add_history(self, request_type, request, response):
+        # Setting the many-to-one side does not load the whole history of the dialog as
+        # appending to `self.user.history` does.
+        object_session(self.user).add(
             HistoryTable(
+                dialog=self.user,
                 request_date=datetime.now(timezone.utc),
-                request_type=RequestType.rpc,
-                request=rpc,
-                response=commands,
+                request_type=request_type,
+                request=request,
+                response=response,
             )
         )
 
@@ -235,13 +249,10 @@ class SQLAlchemyManager:
         :return PersistenceTracker: Persistence tracker of current dialog turn.
         """
         with Session(self.engine) as session:
-            stmt = (
-                select(DialogTable)
-                .where(DialogTable.channel_name == dialog["channel_name"])
-                .where(DialogTable.user_id == str(dialog["user_id"]))
-                .with_for_update()
-            )
-            user = session.scalars(stmt).one_or_none()
+            user = session.scalars(
+                SELECT_DIALOG,
+                {"channel_name": dialog["channel_name"], "user_id": str(dialog["user_id"])},
+            ).one_or_none()
             if user is None:
                 user = DialogTable(channel_name=dialog["channel_name"], user_id=dialog["user_id"])
                 session.add(user)
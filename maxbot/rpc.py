@@ -12,6 +12,10 @@ class RpcManager:
     def __init__(self):
         """Create new class instance."""
         self._schemas = {}
+        # Creating marshmallow schemas is much more expensive than using them, so the instances
+        # are created once and reused for each request.
+        self._params_schemas = {}
+        self._request_schema = RpcRequestSchema()
 
     def __bool__(self):
         """Check if any rpc methods configured."""
@@ -22,7 +26,7 @@ class RpcManager:
 
         :param Resources resources: Bot resources.
         """
-        self._schemas = {}
+        self._schemas, self._params_schemas = {}, {}
         for d in resources.load_rpc(MethodSchema(many=True)):
             method = d["method"]
             if method in self._schemas:
@@ -30,6 +34,7 @@ class RpcManager:
             self._schemas[method] = Schema.from_dict(
                 {p["name"]: fields.Raw(required=p.get("required")) for p in d.get("params", [])}
             )
+            self._params_schemas[method] = self._schemas[method]()
 
     def load_inline_resources(self, source):
         """Load dialog resources from YAML-string.
@@ -42,6 +47,14 @@ class RpcManager:
         """Get the schame to validate method arguments."""
         return self._schemas.get(method)
 
+    def get_params_schema_instance(self, method):
+        """Get a shared instance of the schema to validate method arguments.
+
+        :param str method: Method name.
+        :return Schema|None: Schema instance or `None` if the method is not found.
+        """
+        return self._params_schemas.get(method)
+
     def parse_request(self, request_data):
         """Parse incoming request data.
 
@@ -49,14 +62,14 @@ class RpcManager:
         :return: Parsed request data.
         """
         try:
-            request = RpcRequestSchema().load(request_data)
+            request = self._request_schema.load(request_data)
         except ValidationError as exc:
             raise RpcError("Invalid Request", -32600, exc.normalized_messages()) from exc
 
-        params_schema = self.get_params_schema(request["method"])
+        params_schema = self.get_params_schema_instance(request["method"])
         if params_schema is None:
             raise RpcError("Method not found", -32601, request["method"])
-        errors = params_schema().validate(request.get("params", {}))
+        errors = params_schema.validate(request.get("params", {}))
         if errors:
             raise RpcError("Invalid params", -32602, errors)
 
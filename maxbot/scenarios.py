@@ -1,7 +1,11 @@
 """NLG scenarios and templates."""
 from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Optional
 
 import jinja2
+from jinja2 import nodes
+from jinja2.parser import Parser
 
 from .errors import BotError, YamlSnippet
 from .jinja_env import create_jinja_env
@@ -24,6 +28,9 @@ JINJA_ERRORS = (
 
 FRAME_ANCHOR = "66ef03f1-e601-4497-9891-00bbe4289ab3"
 
+# Maximum number of compiled templates and expressions cached for each jinja environment.
+COMPILED_CACHE_SIZE = 1000
+
 
 class ExpressionField(fields.Field):
     """:class:`~Expression` field.
@@ -114,14 +121,20 @@ class Expression:
     # Compiled expression.
     expr: callable = field(init=False)
 
+    # A function of jinja environment, turn context and params that evaluates the expression,
+    # see :func:`~_compile_expression`.
+    evaluate: callable = field(init=False, repr=False)
+
     def __post_init__(self):
         """Compile an expression."""
         if not hasattr(self.jinja_env, "sync_env"):
             self.jinja_env.extend(sync_env=self.jinja_env.overlay(enable_async=False))
 
         try:
-            self.expr = self.jinja_env.sync_env.compile_expression(
-                self.source, undefined_to_none=False
+            self.expr, self.evaluate = _compile(
+                self.jinja_env,
+                ("expression", type(self.source), self.source),
+                lambda: _compile_expression(self.jinja_env.sync_env, self.source),
             )
         except jinja2.TemplateSyntaxError as exc:
             raise BotError(exc.message, YamlSnippet.from_data(self.source)) from exc
@@ -136,7 +149,7 @@ class Expression:
         :return Any: Expression evaluation result.
         """
         try:
-            value = self.expr(_create_scenario_context(ctx, params))
+            value = self.evaluate(self.jinja_env.sync_env, ctx, params)
             bool(value)  # raise UndefinedError if StrictUndefined
             return value
         except JINJA_ERRORS as exc:
@@ -180,15 +193,30 @@ class Template:
     # Compiled template.
     tpl: callable = field(init=False)
 
+    # The rendered document if the template is a static text, otherwise `None`.
+    static_document: Optional[str] = field(init=False, repr=False)
+
     def __post_init__(self):
         """Compile a template."""
         try:
-            self.tpl = self.jinja_env.from_string(self.content)
+            self.tpl, self.static_document = _compile(
+                self.jinja_env,
+                ("template", self.content),
+                lambda: _compile_template(self.jinja_env, self.content),
+            )
         except jinja2.TemplateSyntaxError as exc:
             raise BotError(
                 exc.message, YamlSnippet.from_data(self.content, line=exc.lineno)
             ) from exc
 
+    @cached_property
+    def _schema(self):
+        """Get a schema instance to deserialize the rendered documents.
+
+        Creating marshmallow schemas is much more expensive than using them.
+        """
+        return self.Schema(many=True)
+
     async def __call__(self, ctx, **params):
         """Render template using scenario context and deserialize commands.
 
@@ -199,7 +227,10 @@ class Template:
         :return list: A list of commands, that matches :class:`~CommandSchema`.
         """
         try:
-            document = await self.tpl.render_async(_create_scenario_context(ctx, params))
+            if self.static_document is not None:
+                document = self.static_document
+            else:
+                document = await self.tpl.render_async(_create_scenario_context(ctx, params))
         except jinja2.TemplateSyntaxError as exc:
             # TODO: using _extract_lineno we have lost the actual location of
             # the error in macros: exc.lineno, exc.filename ...
@@ -212,7 +243,7 @@ class Template:
             ) from exc
 
         try:
-            return self.Schema(many=True).loads(document)
+            return self._schema.loads(document)
         except BotError as exc:
             # wrap original error to include YAML snippet
             raise BotError(
@@ -220,6 +251,89 @@ class Template:
             ) from exc
 
 
+def _compile_expression(jinja_env, source):
+    """Compile an expression and make a shortcut to evaluate it if possible.
+
+    Conditions like `true` or `slots.xxx` are very common in dialog trees. Constant expressions
+    are evaluated in advance, and a single variable name is looked up directly, so we do not run
+    the compiled expression for each turn.
+
+    :param jinja2.Environment jinja_env: Jinja environment used to compile.
+    :param str|bool|int|float source: A source string of the expression.
+    :return tuple[jinja2.environment.TemplateExpression, callable]: Compiled expression and
+        a function of jinja environment, turn context and params that evaluates it.
+    """
+    expr = jinja_env.compile_expression(source, undefined_to_none=False)
+    node = Parser(jinja_env, source, state="variable").parse_expression()
+
+    try:
+        value = node.as_const(nodes.EvalContext(jinja_env))
+    except nodes.Impossible:
+        pass
+    else:
+        # mutable values must be created for each evaluation
+        if isinstance(value, (str, int, float)):
+            return expr, lambda jinja_env, ctx, params: value
+
+    # `self` refers to the template reference, not to a variable
+    if isinstance(node, nodes.Name) and node.name != "self":
+        name = node.name
+
+        # the environment is passed on each call, the function is cached on the environment
+        def lookup(jinja_env, ctx, params):
+            scenario_context = _create_scenario_context(ctx, params)
+            if name in scenario_context:
+                return scenario_context[name]
+            if name in jinja_env.globals:
+                return jinja_env.globals[name]
+            return jinja_env.undefined(name=name)
+
+        return expr, lookup
+
+    return expr, lambda jinja_env, ctx, params: expr(_create_scenario_context(ctx, params))
+
+
+def _compile_template(jinja_env, content):
+    """Compile a template and render it in advance if it is a static text.
+
+    Static text is very common in responses, so we save on rendering them for each turn.
+
+    :param jinja2.Environment jinja_env: Jinja environment used to compile.
+    :param str content: The content of the template.
+    :return tuple[jinja2.Template, str|None]: Compiled template and the static document.
+    """
+    ast = jinja_env.parse(content)
+    static_document = None
+    if all(
+        isinstance(node, nodes.Output)
+        and all(isinstance(n, nodes.TemplateData) for n in node.nodes)
+        for node in ast.body
+    ):
+        static_document = "".join(n.data for node in ast.body for n in node.nodes)
+    return jinja_env.from_string(ast), static_document
+
+
+def _compile(jinja_env, key, compile_):
+    """Compile a template or an expression once for the jinja environment.
+
+    The same sources are compiled many times, e.g. when resources are reloaded. Compiled
+    templates do not change after creation, so they can be safely shared.
+
+    :param jinja2.Environment jinja_env: Jinja environment used to compile.
+    :param tuple key: A key identifying the source.
+    :param callable compile_: A function without arguments that does compile.
+    :return jinja2.Template|jinja2.environment.TemplateExpression:
+    """
+    # the cache lives as long as the environment, compiled templates refer to it anyway
+    if not hasattr(jinja_env, "compiled_cache"):
+        jinja_env.extend(compiled_cache=jinja2.utils.LRUCache(COMPILED_CACHE_SIZE))
+    cache = jinja_env.compiled_cache
+    compiled = cache.get(key)
+    if compiled is None:
+        compiled = cache[key] = compile_()
+    return compiled
+
+
 def _extract_lineno(exc):
     """Extract line where template error is occured assuming that traceback was rewritten by jinja.
 
@@ -20,8 +20,13 @@ class LoaderFactory(yaml.BaseLoader):  # pylint: disable=R0901
     """
 
     @classmethod
-    def new_loader(cls):
-        """Create a dynamic subclass to customize it separately."""
+    def new_loader(cls, libyaml=False):
+        """Create a dynamic subclass to customize it separately.
+
+        :param bool libyaml: Use LibYAML-based parser instead of pure Python one.
+        """
+        if libyaml:
+            return type("ConcreteCLoader", (yaml.CBaseLoader, cls), {})
         return type("ConcreteLoader", (cls,), {})
 
     @classmethod
@@ -62,22 +67,22 @@ class LoaderFactory(yaml.BaseLoader):  # pylint: disable=R0901
             database:
                 url: !ENV postgresql://${DB_USER:paws}:${DB_PASS}@${DB_HOST}:${DB_PORT}/mydatabase
         """
-        variable_re = re.compile(r".*?\$\{([^}{:]+)(:([^}]+))?\}.*?")
+        variable_re = re.compile(r"\$\{([^}{:]+)(?::([^}]+))?\}")
 
         def substitute_variables(loader, node):
-            string = loader.construct_scalar(node)
-            for name, with_colon, default in variable_re.findall(string):
-                if with_colon:
-                    value = os.environ.get(name, default)
-                elif name not in os.environ:
+            def substitute(match):
+                name, default = match.groups()
+                if default is not None:
+                    return os.environ.get(name, default)
+                if name not in os.environ:
                     raise BotError(
                         f"Missing required environment variable {name!r}",
                         YamlSnippet.at_mark(node.start_mark),
                     )
-                else:
-                    value = os.environ[name]
-                string = string.replace(f"${{{name}{with_colon}}}", value, 1)
-            return string
+                return os.environ[name]
+
+            # substitute all the variables in one pass, values are not scanned for variables
+            return variable_re.sub(substitute, loader.construct_scalar(node))
 
         cls.add_constructor("!ENV", substitute_variables)
 
@@ -184,21 +189,45 @@ class RenderConfig:
         * :meth:`~LoaderFactory.register_variable_substitution`.
         * :meth:`~LoaderFactory.set_pre_construct_strict_map_checker`.
         * :meth:`~LoaderFactory.set_post_construct_debug_watcher`.
+
+    File streams are parsed with LibYAML if it is available. Strings are always parsed by the
+    pure Python loader because LibYAML does not keep the document buffer in its marks and
+    :class:`~YamlSymbols` could not build snippets for inline documents. Files that fail to parse
+    are parsed again by the pure Python loader to report errors in its wording.
     """
 
     def __init__(self):
         """Create new class instance."""
-        self.Loader = LoaderFactory.new_loader()
-        self.Loader.register_variable_substitution()
-        self.Loader.register_unknown_tag_error()
-        self.Loader.set_pre_construct_strict_map_checker()
-        self.Loader.set_post_construct_debug_watcher()
+        self.Loader = self._create_loader(libyaml=False)
+        if yaml.__with_libyaml__:
+            self.FileLoader = self._create_loader(libyaml=True)
+        else:
+            self.FileLoader = self.Loader
+
+    @staticmethod
+    def _create_loader(libyaml):
+        Loader = LoaderFactory.new_loader(libyaml)
+        Loader.register_variable_substitution()
+        Loader.register_unknown_tag_error()
+        Loader.set_pre_construct_strict_map_checker()
+        Loader.set_post_construct_debug_watcher()
+        return Loader
 
     def loads(self, data):
         """Deserialize a YAML data structure to an object defined by this Schema's fields.
 
-        :param str data: A YAML string of the data to deserialize.
+        :param str|io.TextIOBase data: A YAML string or a file stream of the data to deserialize.
         """
+        if isinstance(data, str):
+            return self.Loader.load(data)
+        try:
+            return self.FileLoader.load(data)
+        except YamlParsingError:
+            if self.FileLoader is self.Loader or not data.seekable():
+                raise
+        # LibYAML words syntax errors differently and loses some details, e.g. the offending
+        # character, so the file is parsed again to report errors the same way as for strings
+        data.seek(0)
         return self.Loader.load(data)
 
 
@@ -37,10 +37,10 @@ class Stories:
         class _RpcRequestSchemaWithDesc(RpcRequestSchema):
             @validates_schema
             def validates_schema(self, data, **kwargs):
-                params_schema = bot.rpc.get_params_schema(data["method"])
+                params_schema = bot.rpc.get_params_schema_instance(data["method"])
                 if params_schema is None:
                     raise ValidationError("Method not found", field_name="method")
-                errors = params_schema().validate(data.get("params", {}))
+                errors = params_schema.validate(data.get("params", {}))
                 if errors:
                     raise ValidationError(pprint.pformat(errors), field_name="params")
 
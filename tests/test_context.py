@@ -1,4 +1,6 @@
-from dataclasses import fields
+import copy
+import pickle
+from dataclasses import FrozenInstanceError, fields
 
 import pytest
 
@@ -89,6 +91,21 @@ def menu_definition():
     }
 
 
+@pytest.mark.parametrize(
+    "obj",
+    [
+        RecognizedIntent(name="menu", confidence=0.3),
+        RecognizedEntity(name="menu", value="vegan", literal="vegan", start_char=1, end_char=6),
+    ],
+)
+def test_recognized_slots(obj):
+    assert not hasattr(obj, "__dict__")
+    with pytest.raises(FrozenInstanceError):
+        obj.name = "other"
+    assert copy.deepcopy(obj) == obj
+    assert pickle.loads(pickle.dumps(obj)) == obj
+
+
 def test_entities_proxy_phrases(menu_entities, menu_definition):
     standard, vegetarian, cake = menu_entities
     obj = EntitiesProxy((standard, vegetarian), menu_definition)
@@ -101,6 +118,8 @@ def test_entities_proxy_phrases(menu_entities, menu_definition):
     assert obj.vegetarian == True
     assert obj.cake == False
     assert obj.all_values == (standard.value, vegetarian.value)
+    assert obj.all_values is obj.all_values
+    assert obj == EntitiesProxy((standard, vegetarian), menu_definition)
     assert obj.all_objects == (standard, vegetarian)
     with pytest.raises(AttributeError):
         assert obj.xxx
@@ -37,6 +37,16 @@ async def test_process_message(dialog_stub, state_stub):
     assert command == {"text": "Hello world!"}
 
 
+def test_schema_instances():
+    dm = DialogManager()
+    assert dm._get_schema(dm.MessageSchema) is dm._get_schema(MessageSchema)
+    assert dm._get_schema(CommandSchema, many=True).many
+    assert dm._get_schema(CommandSchema, many=True) is not dm._get_schema(CommandSchema)
+
+    dm.MessageSchema = MessageSchema.from_dict({})
+    assert dm._get_schema(dm.MessageSchema) is not dm._get_schema(MessageSchema)
+
+
 async def test_process_message_not_reeady(dialog_stub, state_stub, caplog):
     dm = DialogManager()
     with caplog.at_level(logging.WARNING):
@@ -3,7 +3,7 @@ from textwrap import indent
 import pytest
 import yaml
 
-from maxbot.errors import BotError, YamlSnippet, YamlSymbols
+from maxbot.errors import BotError, YamlSnippet, YamlSymbols, yaml_document_key
 from maxbot.maxml import fields
 from maxbot.schemas import ResourceSchema
 
@@ -62,6 +62,32 @@ def test_yaml_symbols_cleanup_by_name():
     assert YamlSymbols.lookup("source") is None
 
 
+def test_yaml_symbols_several_buffers():
+    n1, n2 = make_node(buffer_="aaa\x00"), make_node(buffer_="bbb\x00")
+    data1, data2, data3 = ["one"], ["two"], ["three"]
+    YamlSymbols.add(data1, n1)
+    YamlSymbols.add(data2, n2)
+    YamlSymbols.add(data3, n1)
+    assert YamlSymbols.lookup(data1) == n1
+    assert YamlSymbols.lookup(data2) == n2
+    assert YamlSymbols.lookup(data3) == n1
+    YamlSymbols.cleanup("aaa")
+    assert YamlSymbols.lookup(data1) is None
+    assert YamlSymbols.lookup(data2) == n2
+    assert YamlSymbols.lookup(data3) is None
+
+
+@pytest.mark.parametrize(
+    "name, buffer_, key",
+    (
+        ("<unicode string>", "aaa\x00", "aaa"),
+        ("file.yaml", None, "file.yaml"),
+    ),
+)
+def test_yaml_document_key(name, buffer_, key):
+    assert yaml_document_key(make_node(name=name, buffer_=buffer_).start_mark) == key
+
+
 def test_yaml_snippet_no_symbols():
     assert YamlSnippet.from_data("hello world") is None
 
@@ -1,3 +1,6 @@
+import subprocess
+import sys
+
 import pytest
 
 from maxbot.errors import BotError
@@ -116,3 +119,14 @@ def test_limits():
     assert data["limits"].max_keepalive_connections == 1
     assert data["limits"].max_connections == 2
     assert data["limits"].keepalive_expiry == 3.0
+
+
+def test_defaults():
+    assert TimeoutSchema.DEFAULT == TimeoutSchema().load({})
+    assert PoolLimitSchema.DEFAULT == PoolLimitSchema().load({})
+    assert TimeoutSchema.DEFAULT is TimeoutSchema.DEFAULT
+
+
+def test_httpx_not_imported():
+    code = "import sys, maxbot; assert 'httpx' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True)
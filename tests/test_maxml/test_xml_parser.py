@@ -1,8 +1,19 @@
+import gc
+import weakref
+
+import marshmallow
 import pytest
 
 from maxbot.errors import BotError
 from maxbot.maxml import Schema, fields, markup
-from maxbot.maxml.xml_parser import Pointer, XmlParser, _ContentHandler, _Error, _ErrorHandler
+from maxbot.maxml.xml_parser import (
+    Pointer,
+    XmlParser,
+    _ContentHandler,
+    _Error,
+    _ErrorHandler,
+    is_known_scalar,
+)
 from maxbot.schemas import CommandSchema
 
 
@@ -26,8 +37,9 @@ def test_error_handler_warning(caplog):
     assert "XML warning" in caplog.text
 
 
-def test_empty_text():
-    commands = _parse_xml("")
+@pytest.mark.parametrize("doc", ("", " \n\t "))
+def test_empty_text(doc):
+    commands = _parse_xml(doc)
     assert commands == []
 
 
@@ -64,6 +76,24 @@ def test_text_whitespace_normalization():
     assert command == {"text": "Line 1 Line 2\nLine 3\nLine 4"}
 
 
+def test_text_chunks_joined():
+    class CustomCommandSchema(Schema):
+        text = markup.Field()
+        scalar = fields.Str()
+
+    text, scalar = _parse_xml(
+        "<text>a &amp;\nb<br />c\n&lt;d</text><scalar>a &amp;\nb</scalar>",
+        schema=CustomCommandSchema(),
+    )
+    assert text["text"].items == [
+        markup.Item(markup.TEXT, "a &\nb"),
+        markup.Item(markup.START_TAG, "br"),
+        markup.Item(markup.END_TAG, "br"),
+        markup.Item(markup.TEXT, "c\n<d"),
+    ]
+    assert scalar == {"scalar": "a &\nb"}
+
+
 def test_image():
     url = "http://localhost/image.png"
     (command,) = _parse_xml(f'<image url="{url}" />')
@@ -129,6 +159,83 @@ def test_unexpected_text():
     assert "Element 'test' has undescribed text" in excinfo.value.message
 
 
+def test_nested_schema_not_created(monkeypatch):
+    class Image(Schema):
+        url = fields.Str()
+        caption = fields.Str(metadata={"maxml": "element"})
+
+    class CustomCommandSchema(Schema):
+        image = fields.Nested(Image)
+
+    schema = CustomCommandSchema()
+    created = []
+    init = marshmallow.Schema.__init__
+
+    def _init(self, *args, **kwargs):
+        created.append(self)
+        init(self, *args, **kwargs)
+
+    monkeypatch.setattr(marshmallow.Schema, "__init__", _init)
+
+    doc = '<image url="http://localhost/image.png"><caption>Hello</caption></image>'
+    for _ in range(2):
+        (command,) = _parse_xml(doc, schema=schema)
+        assert command == {"image": {"url": "http://localhost/image.png", "caption": "Hello"}}
+    assert created == []
+
+
+def test_nested_schema_callable():
+    class Image(Schema):
+        url = fields.Str()
+
+    class CustomCommandSchema(Schema):
+        image = fields.Nested(lambda: Image())
+
+    (command,) = _parse_xml('<image url="http://localhost/image.png" />', CustomCommandSchema())
+    assert command == {"image": {"url": "http://localhost/image.png"}}
+
+
+def test_nested_schema_callable_collected():
+    class Node(Schema):
+        class Meta:
+            register = False
+
+        name = fields.Str()
+        child = fields.Nested(lambda: Node())
+
+    class CustomCommandSchema(Schema):
+        class Meta:
+            register = False
+
+        node = fields.Nested(Node)
+
+    (command,) = _parse_xml('<node name="a"><child name="b" /></node>', CustomCommandSchema())
+    assert command == {"node": {"name": "a", "child": {"name": "b"}}}
+
+    ref = weakref.ref(Node._declared_fields["child"].nested)
+    del Node, CustomCommandSchema
+    gc.collect()
+    assert ref() is None
+
+
+def test_nested_schema_fields_changed_in_init():
+    class Image(Schema):
+        url = fields.Str()
+        caption = fields.Str()
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.declared_fields["caption"] = fields.Str(metadata={"maxml": "element"})
+
+    class CustomCommandSchema(Schema):
+        image = fields.Nested(Image)
+
+    doc = '<image url="http://localhost/image.png"><caption>Hello</caption></image>'
+    for _ in range(2):
+        (command,) = _parse_xml(doc, schema=CustomCommandSchema())
+        assert command == {"image": {"url": "http://localhost/image.png", "caption": "Hello"}}
+
+
 def test_forbidden_field():
     class CustomCommandSchema(Schema):
         forbidden = fields.Dict()
@@ -642,10 +749,51 @@ line
     assert symbols[id(c4["text"])] == Pointer(7, 0)
 
 
+def test_symbols_not_collected():
+    calls = []
+
+    class ContentHandler(_ContentHandler):
+        def _get_ptr(self):
+            calls.append(None)
+            return super()._get_ptr()
+
+    class Parser(XmlParser):
+        CONTENT_HANDLER_CLASS = ContentHandler
+
+    (command,) = Parser().loads(
+        '<image url="https://127.0.0.1"><caption>image caption</caption></image>',
+        maxml_command_schema=CommandSchema(),
+    )
+    assert command == {"image": {"url": "https://127.0.0.1", "caption": "image caption"}}
+    assert calls == []
+
+
 def test_escaped_quotation():
     (command,) = _parse_xml("&#34;")
     command = {"text": '"'}
 
 
+class _Url(fields.Url):
+    pass
+
+
+@pytest.mark.parametrize(
+    "field, expected",
+    (
+        (fields.Str(), True),
+        (fields.Integer(), True),
+        (fields.Boolean(), True),
+        (fields.Date(), True),
+        (fields.TimeDelta(), True),
+        (_Url(), True),
+        (markup.Field(), False),
+        (fields.Nested(Schema), False),
+        (fields.List(fields.Str()), False),
+    ),
+)
+def test_is_known_scalar(field, expected):
+    assert is_known_scalar(field) is expected
+
+
 def _parse_xml(doc, schema=CommandSchema(), symbols=None):
     return XmlParser().loads(doc, maxml_command_schema=schema, maxml_symbols=symbols)
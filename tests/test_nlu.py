@@ -1,3 +1,5 @@
+import subprocess
+import sys
 from unittest.mock import Mock
 
 import pytest
@@ -18,13 +20,38 @@ from maxbot.nlu import (
     SpacyMatcherEntities,
 )
 
+_TEST_TEXTS = (
+    "Hello",
+    "how are you",
+    "i'd like to go to sleep",
+    "i would like something vegan",
+    "What are your dessert menu?",
+    "Show me the standard menu",
+    "My order number is AB12345",
+    "2022 May 15",
+    "There was 2022 May 15. It was cold.",
+    "not a date",
+    "I will come at 5 pm",
+    "it was February 22, 2022 at 6pm",
+    "1984",
+    "friday",
+    "I have two hats and thirty seven coats",
+    "my mail is user@example.com, thats it",
+    "go to https://example.com",
+)
+
 
 @pytest.fixture(scope="session")
 def spacy_nlp():
     return spacy.blank("en")
 
 
-def test_similarity_recognizer(spacy_nlp):
+@pytest.fixture(scope="session")
+def docs(spacy_nlp):
+    return dict(zip(_TEST_TEXTS, spacy_nlp.pipe(_TEST_TEXTS, batch_size=64)))
+
+
+def test_similarity_recognizer(spacy_nlp, docs):
     similarity_recognizer = SimilarityRecognizer(spacy_nlp)
     similarity_recognizer.load(
         IntentSchema(many=True).load(
@@ -48,23 +75,74 @@ def test_similarity_recognizer(spacy_nlp):
         )
     )
 
-    (intent,) = similarity_recognizer(spacy_nlp("Hello"))
+    (intent,) = similarity_recognizer(docs["Hello"])
     assert intent.confidence > 0.5
     assert intent.name == "hello"
 
-    (intent,) = similarity_recognizer(spacy_nlp("how are you"))
+    (intent,) = similarity_recognizer(docs["how are you"])
     assert intent.confidence > 0.5
     assert intent.name == "how_are_you"
 
-    assert not similarity_recognizer(spacy_nlp("i'd like to go to sleep"))
+    assert not similarity_recognizer(docs["i'd like to go to sleep"])
 
     # reload
     similarity_recognizer.load([])
-    assert not similarity_recognizer(spacy_nlp("Hello"))
-    assert not similarity_recognizer(spacy_nlp("how are you"))
+    assert not similarity_recognizer(docs["Hello"])
+    assert not similarity_recognizer(docs["how are you"])
+
+
+def test_similarity_recognizer_scores(spacy_nlp):
+    import textdistance
+
+    examples = ["how are you", "how how are you doing?", "hey", "you you you"]
+    similarity_recognizer = SimilarityRecognizer(spacy_nlp)
+    similarity_recognizer.load(IntentSchema(many=True).load([{"name": "x", "examples": examples}]))
+
+    for text in ["how are you", "you how", "hey you", "you, you and you", "sleep", ""]:
+        tokens = similarity_recognizer._preprocess(spacy_nlp.make_doc(text))
+        expected = {
+            i: textdistance.cosine.similarity(tokens, similarity_recognizer._preprocess(e))
+            for i, e in enumerate(similarity_recognizer.examples)
+        }
+        scores = similarity_recognizer._scores(tokens)
+        assert scores == {i: score for i, score in expected.items() if score}
+
+
+def test_similarity_recognizer_similarity_override(spacy_nlp):
+    class ExactRecognizer(SimilarityRecognizer):
+        @property
+        def similarity(self):
+            return lambda a, b: float(a == b)
+
+    intents = IntentSchema(many=True).load([{"name": "x", "examples": ["how are you"]}])
+    recognizer = ExactRecognizer(spacy_nlp)
+    recognizer.load(intents)
+    assert not recognizer(spacy_nlp.make_doc("how are you doing"))
+    (intent,) = recognizer(spacy_nlp.make_doc("How are you"))
+    assert intent.name == "x"
+
+    recognizer = SimilarityRecognizer(spacy_nlp)
+    recognizer.load(intents)
+    recognizer.similarity = lambda a, b: 1.0
+    (intent,) = recognizer(spacy_nlp.make_doc("sleep"))
+    assert intent.name == "x"
+
 
+def test_similarity_recognizer_examples_mutated(spacy_nlp):
+    recognizer = SimilarityRecognizer(spacy_nlp)
+    recognizer.load(IntentSchema(many=True).load([{"name": "x", "examples": ["how are you"]}]))
+    assert not recognizer(spacy_nlp.make_doc("good night"))
 
-def test_phrase_entities(spacy_nlp):
+    recognizer.examples.append(spacy_nlp.make_doc("good night"))
+    recognizer.labels.append("y")
+    (intent,) = recognizer(spacy_nlp.make_doc("good night"))
+    assert intent.name == "y"
+
+    del recognizer.examples[1], recognizer.labels[1]
+    assert not recognizer(spacy_nlp.make_doc("good night"))
+
+
+def test_phrase_entities(spacy_nlp, docs):
     phrase_entities = PhraseEntities(spacy_nlp)
     phrase_entities.load(
         EntitySchema(many=True).load(
@@ -90,29 +168,29 @@ def test_phrase_entities(spacy_nlp):
         ),
     )
 
-    (entity,) = phrase_entities(spacy_nlp("i would like something vegan"))
+    (entity,) = phrase_entities(docs["i would like something vegan"])
     assert entity.name == "menu"
     assert entity.value == "vegetarian"
     assert entity.literal == "vegan"
 
-    (entity,) = phrase_entities(spacy_nlp("What are your dessert menu?"))
+    (entity,) = phrase_entities(docs["What are your dessert menu?"])
     assert entity.name == "menu"
     assert entity.value == "cake"
     assert entity.literal == "dessert menu"
 
-    (entity,) = phrase_entities(spacy_nlp("Show me the standard menu"))
+    (entity,) = phrase_entities(docs["Show me the standard menu"])
     assert entity.name == "menu"
     assert entity.value == "standard"
     assert entity.literal == "standard menu"
 
     # reload
     phrase_entities.load([])
-    assert not list(phrase_entities(spacy_nlp("i would like something vegan")))
-    assert not list(phrase_entities(spacy_nlp("What are your dessert menu?")))
-    assert not list(phrase_entities(spacy_nlp("Show me the standard menu")))
+    assert not list(phrase_entities(docs["i would like something vegan"]))
+    assert not list(phrase_entities(docs["What are your dessert menu?"]))
+    assert not list(phrase_entities(docs["Show me the standard menu"]))
 
 
-def test_regexp_entities(spacy_nlp):
+def test_regexp_entities(docs):
     regexp_entities = RegexpEntities()
     regexp_entities.load(
         EntitySchema(many=True).load(
@@ -125,32 +203,32 @@ def test_regexp_entities(spacy_nlp):
         ),
     )
 
-    (entity,) = regexp_entities(spacy_nlp("My order number is AB12345"))
+    (entity,) = regexp_entities(docs["My order number is AB12345"])
     assert entity.name == "order_number"
     assert entity.value == "order_syntax"
     assert entity.literal == "AB12345"
 
     # reload
     regexp_entities.load([])
-    assert not list(regexp_entities(spacy_nlp("My order number is AB12345")))
+    assert not list(regexp_entities(docs["My order number is AB12345"]))
 
 
-def test_dateparser_entities(spacy_nlp):
+def test_dateparser_entities(docs):
     entity_recognizer = DateParserEntities()
 
-    (entity,) = entity_recognizer(spacy_nlp("2022 May 15"))
+    (entity,) = entity_recognizer(docs["2022 May 15"])
     assert entity.name == "date"
     assert entity.value == "2022-05-15"
     assert entity.literal == "2022 May 15"
 
-    (entity,) = entity_recognizer(spacy_nlp("There was 2022 May 15. It was cold."))
+    (entity,) = entity_recognizer(docs["There was 2022 May 15. It was cold."])
     assert entity.name == "date"
     assert entity.value == "2022-05-15"
     assert entity.literal == "2022 May 15"
 
-    assert not list(entity_recognizer(spacy_nlp("not a date")))
+    assert not list(entity_recognizer(docs["not a date"]))
 
-    (entity,) = entity_recognizer(spacy_nlp("I will come at 5 pm"))
+    (entity,) = entity_recognizer(docs["I will come at 5 pm"])
     assert entity.name == "time"
     assert entity.value == "17:00:00"
     assert entity.literal == "at 5 pm"
@@ -158,7 +236,7 @@ def test_dateparser_entities(spacy_nlp):
     (
         date,
         time,
-    ) = entity_recognizer(spacy_nlp("it was February 22, 2022 at 6pm"))
+    ) = entity_recognizer(docs["it was February 22, 2022 at 6pm"])
     assert date.name == "date"
     assert date.value == "2022-02-22"
     assert date.literal == "February 22, 2022 at 6pm"
@@ -166,25 +244,44 @@ def test_dateparser_entities(spacy_nlp):
     assert time.value == "18:00:00"
     assert time.literal == "February 22, 2022 at 6pm"
 
-    (date,) = entity_recognizer(spacy_nlp("1984"))
+    (date,) = entity_recognizer(docs["1984"])
     assert date.name == "latent_date"
     assert date.value.startswith("1984-")
     assert date.literal == "1984"
 
 
+def test_dateparser_entities_ddp(docs):
+    entity_recognizer = DateParserEntities()
+    assert entity_recognizer.ddp is None
+    (entity,) = entity_recognizer(docs["I will come at 5 pm"])
+    assert entity.name == "time"
+
+    # the parser is shared between instances
+    other = DateParserEntities()
+    list(other(docs["I will come at 5 pm"]))
+    assert other.ddp is entity_recognizer.ddp is not None
+
+    # custom parser is used to split date and time parts
+    custom = DateParserEntities()
+    custom.ddp = Mock(wraps=entity_recognizer.ddp)
+    (entity,) = custom(docs["I will come at 5 pm"])
+    assert entity.name == "time"
+    custom.ddp.get_date_data.assert_called_once_with("at 5 pm")
+
+
 @freeze_time("2023-04-08")
-def test_dateparser_entities_prefer_future(spacy_nlp):
+def test_dateparser_entities_prefer_future(docs):
     entity_recognizer = DateParserEntities()
 
     # prefer nearest friday from future
-    (entity,) = entity_recognizer(spacy_nlp("friday"))
+    (entity,) = entity_recognizer(docs["friday"])
     assert entity.value == "2023-04-14"
 
 
-def test_spacy_matcher_entities(spacy_nlp):
+def test_spacy_matcher_entities(spacy_nlp, docs):
     entity_recognizer = SpacyMatcherEntities(spacy_nlp)
 
-    two, thirty_seven = entity_recognizer(spacy_nlp("I have two hats and thirty seven coats"))
+    two, thirty_seven = entity_recognizer(docs["I have two hats and thirty seven coats"])
     assert two.name == "number"
     assert two.value == 2
     assert two.literal == "two"
@@ -192,17 +289,35 @@ def test_spacy_matcher_entities(spacy_nlp):
     assert thirty_seven.value == 37
     assert thirty_seven.literal == "thirty seven"
 
-    (email,) = entity_recognizer(spacy_nlp("my mail is user@example.com, thats it"))
+    (email,) = entity_recognizer(docs["my mail is user@example.com, thats it"])
     assert email.name == "email"
     assert email.value == "user@example.com"
     assert email.literal == "user@example.com"
 
-    (url,) = entity_recognizer(spacy_nlp("go to https://example.com"))
+    (url,) = entity_recognizer(docs["go to https://example.com"])
     assert url.name == "url"
     assert url.value == "https://example.com"
     assert url.literal == "https://example.com"
 
 
+def test_spacy_matcher_entities_parse_number_override(spacy_nlp, docs):
+    class CustomEntities(SpacyMatcherEntities):
+        def _parse_number(self, text):
+            return -super()._parse_number(text)
+
+    two, thirty_seven = CustomEntities(spacy_nlp)(docs["I have two hats and thirty seven coats"])
+    assert two.value == -2
+    assert thirty_seven.value == -37
+
+
+def test_spacy_matcher_entities_shared_matcher(spacy_nlp):
+    assert SpacyMatcherEntities(spacy_nlp).matcher is SpacyMatcherEntities(spacy_nlp).matcher
+    assert (
+        SpacyMatcherEntities(spacy_nlp).matcher
+        is not SpacyMatcherEntities(spacy.blank("en")).matcher
+    )
+
+
 async def test_nlu(spacy_nlp, dialog_stub):
     hello = RecognizedIntent("hello", 0.3)
     goodbye = RecognizedIntent("goodbye", 0.6)
@@ -269,6 +384,18 @@ async def test_entities_overlap_number(spacy_nlp, dialog_stub):
     assert entities.number
 
 
+def test_nlu_lazy_imports():
+    code = (
+        "import sys, maxbot.nlu;"
+        "print(sorted(m for m in ('dateparser', 'spacy', 'babel', 'number_parser') "
+        "if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
+
+
 def test_nlu_defaults(spacy_nlp):
     nlu = Nlu(spacy_nlp)
     assert isinstance(nlu.intent_recognizer, SimilarityRecognizer)
@@ -333,6 +460,51 @@ def test_nlu_load_resouces(spacy_nlp):
     }
 
 
+def test_nlu_definitions_cache(spacy_nlp):
+    nlu = Nlu(spacy_nlp)
+    nlu.entity_recognizers = [Mock(builtin_definitions=[{"name": "number"}])]
+    assert nlu.resolve_entity_definitions() == {"number": {"name": "number"}}
+    assert nlu.resolve_entity_definitions() is nlu.resolve_entity_definitions()
+
+    nlu.entity_recognizers = [Mock(builtin_definitions=[{"name": "email"}])]
+    assert nlu.resolve_entity_definitions() == {"email": {"name": "email"}}
+
+    nlu.load_inline_resources(
+        """
+        intents:
+          - name: intent1
+            examples:
+              - intent 1
+        entities:
+          - name: entity1
+            values: []
+    """
+    )
+    assert nlu.resolve_intent_definitions() == {
+        "intent1": {"name": "intent1", "examples": ["intent 1"]}
+    }
+    assert nlu.resolve_entity_definitions() == {
+        "entity1": {"name": "entity1", "values": []},
+        "email": {"name": "email"},
+    }
+
+
+def test_nlu_definitions_cache_recognizers_mutated(spacy_nlp):
+    nlu = Nlu(spacy_nlp)
+    number = Mock(builtin_definitions=[{"name": "number"}])
+    nlu.entity_recognizers = [number]
+    assert nlu.resolve_entity_definitions() == {"number": {"name": "number"}}
+
+    nlu.entity_recognizers.append(Mock(builtin_definitions=[{"name": "email"}]))
+    assert nlu.resolve_entity_definitions() == {
+        "number": {"name": "number"},
+        "email": {"name": "email"},
+    }
+
+    nlu.entity_recognizers.remove(number)
+    assert nlu.resolve_entity_definitions() == {"email": {"name": "email"}}
+
+
 @pytest.mark.parametrize(
     "intent,error",
     (
@@ -1,10 +1,16 @@
 import pytest
+from sqlalchemy import event as sa_event
 from sqlalchemy import select
 from sqlalchemy.exc import StatementError
 from sqlalchemy.orm import Session
 
 from maxbot.maxml import markup
-from maxbot.persistence_manager import DialogTable, RequestType, SQLAlchemyManager
+from maxbot.persistence_manager import (
+    DialogTable,
+    RequestType,
+    SQLAlchemyManager,
+    create_json_serializer,
+)
 from maxbot.webapp import Factory
 
 
@@ -49,6 +55,20 @@ def test_state_update(event):
         assert v.value == "value2"
 
 
+def test_state_separate_dialogs(event):
+    persistence_manager = SQLAlchemyManager()
+    other = {"channel_name": "test", "user_id": 456}
+    with persistence_manager(event) as tracker:
+        tracker.get_state().user["user1"] = "value1"
+    with persistence_manager(other) as tracker:
+        tracker.get_state().user["user1"] = "value2"
+
+    with persistence_manager(event) as tracker:
+        assert tracker.get_state().user == {"user1": "value1"}
+    with persistence_manager(other) as tracker:
+        assert tracker.get_state().user == {"user1": "value2"}
+
+
 def test_state_update_inplace(event):
     persistence_manager = SQLAlchemyManager()
     with persistence_manager(event) as tracker:
@@ -118,6 +138,25 @@ def test_history_rpc(event):
         assert turn.response == []
 
 
+def test_history_not_loaded(event):
+    persistence_manager = SQLAlchemyManager()
+    with persistence_manager(event) as tracker:
+        tracker.set_message_history({"n": 1}, [])
+
+    statements = []
+    sa_event.listen(
+        persistence_manager.engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    with persistence_manager(event) as tracker:
+        tracker.set_rpc_history({"n": 2}, [])
+    assert not [s for s in statements if s.startswith("SELECT") and "FROM history" in s]
+
+    with persistence_manager(event) as tracker:
+        assert [turn.request for turn in tracker.user.history] == [{"n": 1}, {"n": 2}]
+
+
 def _default(tmp_path):
     return SQLAlchemyManager()
 
@@ -161,3 +200,15 @@ def test_history_json_not_serializable(event, factory, tmp_path):
             tracker.set_rpc_history({}, [{"custom": Value()}])
 
     assert "Object of type Value is not JSON serializable" in str(excinfo.value)
+
+
+def test_json_serializer_default_serializers():
+    class Value:
+        pass
+
+    serializer = create_json_serializer([(Value, lambda o: "value")])
+    assert (
+        serializer({"a": [Value(), 1]}) == serializer({"a": [Value(), 1]}) == '{"a": ["value", 1]}'
+    )
+    with pytest.raises(TypeError):
+        serializer(object())
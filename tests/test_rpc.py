@@ -30,6 +30,13 @@ def test_parse_request(rpc):
     assert request["method"] == "say_hello"
 
 
+def test_get_params_schema_instance(rpc):
+    schema = rpc.get_params_schema_instance("say_hello")
+    assert isinstance(schema, rpc.get_params_schema("say_hello"))
+    assert rpc.get_params_schema_instance("say_hello") is schema
+    assert rpc.get_params_schema_instance("unknown") is None
+
+
 def test_duplicate_method(rpc):
     with pytest.raises(BotError) as excinfo:
         rpc.load_inline_resources(
@@ -118,14 +125,16 @@ def test_invalid_request(rpc):
 #    assert excinfo.value.data == "Expecting value: line 1 column 1 (char 0)"
 
 
-def test_endpoint_success(rpc):
+async def test_endpoint_success(rpc):
     callback = AsyncMock()
 
     from sanic import Sanic
 
     app = Sanic(__name__)
     app.blueprint(rpc.blueprint({"my_channel": sentinel.my_channel}, callback))
-    request, response = app.test_client.post("/rpc/my_channel/123", json={"method": "say_hello"})
+    request, response = await app.asgi_client.post(
+        "/rpc/my_channel/123", json={"method": "say_hello"}
+    )
 
     assert response.status_code == 200, response.text
     assert response.json == {"result": None}
@@ -137,14 +146,16 @@ def test_endpoint_success(rpc):
     assert user_id == "123"
 
 
-def test_endpoint_error(rpc):
+async def test_endpoint_error(rpc):
     callback = AsyncMock()
 
     from sanic import Sanic
 
     app = Sanic(__name__)
     app.blueprint(rpc.blueprint({}, callback))
-    request, response = app.test_client.post("/rpc/my_channel/123", json={"method": "say_hello"})
+    request, response = await app.asgi_client.post(
+        "/rpc/my_channel/123", json={"method": "say_hello"}
+    )
 
     assert response.status_code == 200, response.text
     assert response.json == {
@@ -1,9 +1,12 @@
+import gc
+import weakref
 from datetime import datetime, timedelta
 
 import pytest
 
 from maxbot.context import TurnContext
 from maxbot.errors import BotError
+from maxbot.jinja_env import create_jinja_env
 from maxbot.maxml import Schema, fields, validate
 from maxbot.scenarios import Expression, ExpressionField, ScenarioField, Template
 from maxbot.schemas import MaxmlSchema, ResourceSchema
@@ -60,6 +63,67 @@ async def test_expression_params():
     assert expr(ctx, param1="hello") == "hello"
 
 
+def test_compiled_cache():
+    assert Template("hello").tpl is Template("hello").tpl
+    assert Expression("true").expr is Expression("true").expr
+    assert Template("hello").tpl is not Template("hello", jinja_env=create_jinja_env()).tpl
+    assert Expression(True).expr is not Expression(1).expr
+
+
+def test_compiled_cache_released():
+    jinja_env = create_jinja_env()
+    Template("hello {{ param1 }}", jinja_env=jinja_env)
+    Expression("param1", jinja_env)
+    assert len(jinja_env.compiled_cache) == 2
+
+    ref = weakref.ref(jinja_env)
+    del jinja_env
+    gc.collect()
+    assert ref() is None
+
+
+@pytest.mark.parametrize(
+    "content, static_document",
+    [
+        ("hello", "hello"),
+        ("   ", "   "),
+        ("hello\n", "hello"),
+        ("{% raw %}{{ param1 }}{% endraw %}", "{{ param1 }}"),
+        ("{{ param1 }}", None),
+        ("{# comment #}hello", "hello"),
+    ],
+)
+async def test_template_static(content, static_document):
+    template = Template(content)
+    assert template.static_document == static_document
+    document = await template.tpl.render_async(param1="hello")
+    assert await template(make_context(), param1="hello") == template._schema.loads(document)
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        True,
+        1,
+        "true",
+        "none",
+        "'hello'",
+        "1 + 2",
+        "[1, 2]",
+        "param1",
+        "xxx",
+        "range",
+        "message.text",
+    ],
+)
+def test_expression_evaluate(source):
+    expr = Expression(source)
+    ctx = make_context()
+    params = {"param1": "hello"}
+    value = expr.evaluate(expr.jinja_env.sync_env, ctx, params)
+    assert value == expr.expr(ctx.create_scenario_context(params))
+
+
 async def test_expression_compile_error():
     with pytest.raises(BotError) as excinfo:
         Expression("$%")
@@ -1,4 +1,5 @@
 import pytest
+import yaml
 
 from maxbot.errors import BotError
 from maxbot.maxml import Schema, fields
@@ -133,6 +134,21 @@ def test_variable_substitution_different_defaults():
     assert config["s"] == "xxx/yyy"
 
 
+def test_variable_substitution_value_not_substituted(monkeypatch):
+    class C(ResourceSchema):
+        s = fields.Str()
+
+    monkeypatch.setenv("SOME_VAR", "${OTHER_VAR}")
+    monkeypatch.setenv("OTHER_VAR", "yyy")
+
+    config = C().loads(
+        """
+        s: !ENV ${SOME_VAR}/${OTHER_VAR}
+    """
+    )
+    assert config["s"] == "${OTHER_VAR}/yyy"
+
+
 def test_yaml_error():
     class C(ResourceSchema):
         s = fields.Str()
@@ -238,6 +254,76 @@ def test_load_file(tmpdir):
     assert data == {"a": "A"}
 
 
+def test_load_file_mapping_twice(tmpdir):
+    class C(ResourceSchema):
+        a = fields.String()
+
+    p = tmpdir / "p.yaml"
+    p.write("a: X\na: Y\n")
+    with pytest.raises(BotError) as excinfo:
+        C().load_file(p)
+    assert str(excinfo.value) == (
+        "caused by yaml.constructor.ConstructorError: While constructing a mapping\n"
+        f'  in "{p}", line 1, column 1:\n'
+        "    a: X\n"
+        "    ^^^\n"
+        "    a: Y\n"
+        'found duplicate key: "a"\n'
+        f'  in "{p}", line 2, column 1:\n'
+        "    a: X\n"
+        "    a: Y\n"
+        "    ^^^\n"
+    )
+
+
+def test_load_file_scanner_error(tmpdir):
+    class C(ResourceSchema):
+        a = fields.Raw()
+
+    p = tmpdir / "p.yaml"
+    p.write("a: b: c\n")
+    with pytest.raises(BotError) as excinfo:
+        C().load_file(p)
+    assert str(excinfo.value) == (
+        "caused by yaml.scanner.ScannerError: mapping values are not allowed here\n"
+        f'  in "{p}", line 1, column 5:\n'
+        "    a: b: c\n"
+        "        ^^^\n"
+    )
+
+
+def test_load_file_tab_error(tmpdir):
+    class C(ResourceSchema):
+        a = fields.Raw()
+
+    p = tmpdir / "p.yaml"
+    p.write("a:\n\t- b\n")
+    with pytest.raises(BotError) as excinfo:
+        C().load_file(p)
+    assert str(excinfo.value) == (
+        "caused by yaml.scanner.ScannerError: while scanning for the next token\n"
+        "found character '\\t' that cannot start any token\n"
+        f'  in "{p}", line 2, column 1:\n'
+        "    a:\n"
+        "    \t- b\n"
+        "    ^^^\n"
+    )
+
+
+@pytest.mark.skipif(not yaml.__with_libyaml__, reason="LibYAML is not available")
+def test_load_file_libyaml(tmpdir):
+    class C(ResourceSchema):
+        a = fields.String()
+
+    render_module = C.Meta.render_module
+    assert issubclass(render_module.FileLoader, yaml.CBaseLoader)
+    assert not issubclass(render_module.Loader, yaml.CBaseLoader)
+
+    p = tmpdir / "p.yaml"
+    p.write("a: !ENV ${MAXBOT_UNDEFINED_VARIABLE:A}")
+    assert C().load_file(p) == {"a": "A"}
+
+
 def test_mapping_twice():
     class C(ResourceSchema):
         a = fields.String()
@@ -10,20 +10,27 @@ def mock_resolve_bot(monkeypatch):
     monkeypatch.setattr(maxbot.stories.pytest, "BotResolver", Mock())
 
 
-def test_file(testdir, monkeypatch):
-    stories_file = testdir.tmpdir / "stories.yaml"
+def _runpytest(pytester, path):
+    # run in-process without writing the cache to the test directory
+    return pytester.runpytest_inprocess(
+        "-p", "maxbot_stories", "--bot", "my_bot", "-p", "no:cacheprovider", path
+    )
+
+
+def test_file(pytester, monkeypatch):
+    stories_file = pytester.path / "stories.yaml"
     stories_file.write_text("", encoding="utf8")
 
     stories = Mock()
     stories.load = Mock(return_value=[{"name": f"story{i}", "markers": []} for i in range(2)])
     monkeypatch.setattr(maxbot.stories.pytest, "Stories", Mock(return_value=stories))
 
-    result = testdir.runpytest("-p", "maxbot_stories", "--bot", "my_bot", stories_file)
+    result = _runpytest(pytester, stories_file)
     result.stdout.fnmatch_lines(["*2 passed*"])
 
 
-def test_directory(testdir, monkeypatch):
-    stories_dir = testdir.tmpdir / "stories"
+def test_directory(pytester, monkeypatch):
+    stories_dir = pytester.path / "stories"
     stories_dir.mkdir()
     for i in range(3):
         (stories_dir / f"{i}.yaml").write_text("", encoding="utf8")
@@ -32,12 +39,12 @@ def test_directory(testdir, monkeypatch):
     stories.load = Mock(return_value=[{"name": f"story{i}", "markers": []} for i in range(2)])
     monkeypatch.setattr(maxbot.stories.pytest, "Stories", Mock(return_value=stories))
 
-    result = testdir.runpytest("-p", "maxbot_stories", "--bot", "my_bot", stories_dir)
+    result = _runpytest(pytester, stories_dir)
     result.stdout.fnmatch_lines(["*6 passed*"])
 
 
-def test_fail(testdir, monkeypatch):
-    stories_file = testdir.tmpdir / "stories.yaml"
+def test_fail(pytester, monkeypatch):
+    stories_file = pytester.path / "stories.yaml"
     stories_file.write_text("", encoding="utf8")
 
     stories = Mock()
@@ -50,7 +57,7 @@ def test_fail(testdir, monkeypatch):
     stories.MismatchError = _MismatchError
     monkeypatch.setattr(maxbot.stories.pytest, "Stories", Mock(return_value=stories))
 
-    result = testdir.runpytest("-p", "maxbot_stories", "--bot", "my_bot", stories_file)
+    result = _runpytest(pytester, stories_file)
     result.stdout.fnmatch_lines(
         [
             "*FAILED stories.yaml::story1 - RuntimeError*",
@@ -59,8 +66,8 @@ def test_fail(testdir, monkeypatch):
     )
 
 
-def test_xfail(testdir, monkeypatch):
-    stories_file = testdir.tmpdir / "stories.yaml"
+def test_xfail(pytester, monkeypatch):
+    stories_file = pytester.path / "stories.yaml"
     stories_file.write_text("", encoding="utf8")
 
     stories = Mock()
@@ -73,13 +80,13 @@ def test_xfail(testdir, monkeypatch):
     stories.MismatchError = _MismatchError
     monkeypatch.setattr(maxbot.stories.pytest, "Stories", Mock(return_value=stories))
 
-    result = testdir.runpytest("-p", "maxbot_stories", "--bot", "my_bot", stories_file)
+    result = _runpytest(pytester, stories_file)
     result.stdout.no_fnmatch_line("*FAILED stories.yaml::story1 - RuntimeError*")
     result.stdout.fnmatch_lines(["*1 xfailed*"])
 
 
-def test_mismatch(testdir, monkeypatch):
-    stories_file = testdir.tmpdir / "stories.yaml"
+def test_mismatch(pytester, monkeypatch):
+    stories_file = pytester.path / "stories.yaml"
     stories_file.write_text("", encoding="utf8")
 
     stories = Mock()
@@ -92,7 +99,7 @@ def test_mismatch(testdir, monkeypatch):
     stories.run = Mock(side_effect=_MismatchError())
     monkeypatch.setattr(maxbot.stories.pytest, "Stories", Mock(return_value=stories))
 
-    result = testdir.runpytest("-p", "maxbot_stories", "--bot", "my_bot", stories_file)
+    result = _runpytest(pytester, stories_file)
     result.stdout.fnmatch_lines(
         [
             "*XyZ*",
@@ -39,8 +39,9 @@ class Task:
         await self._idle()
 
     async def _idle(self):
-        await asyncio.sleep(0)  # give the task a chance to release
-        await asyncio.sleep(0)  # give next task a chance to acquire
+        # the lock wakes up the next task when released, that is before the task is done,
+        # so the next task has already acquired the lock when we are woken up
+        await asyncio.wait({self.asyncio_task})
 
 
 DIALOG_1 = {"channel_name": "some_channel", "user_id": "123"}
@@ -105,11 +106,14 @@ async def test_cancelled(locks):
 
 async def test_locks_fifo(locks):
     tasks = [Task(locks, DIALOG_1) for i in range(10)]
+    acquired = []
+    for i, task in enumerate(tasks):
+        task.acquired.add_done_callback(lambda _, i=i: acquired.append(i))
     await asyncio.sleep(0)  # start tasks
 
-    for i, task in enumerate(tasks):
-        assert task.is_acquired
-        # the rest of tasks a still locked
-        for t in tasks[i + 1 :]:
-            assert t.is_locked
-        await task.complete()
+    assert [t.is_acquired for t in tasks] == [True] + [False] * 9
+    # the order of acquisition does not depend on the order in which tasks are done
+    for task in reversed(tasks):
+        task.done.set_result(None)
+    await asyncio.gather(*(t.asyncio_task for t in tasks))
+    assert acquired == list(range(10))
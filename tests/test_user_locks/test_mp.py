@@ -3,9 +3,12 @@ import logging
 from contextlib import asynccontextmanager, contextmanager
 from multiprocessing import current_process, get_context
 from os import unlink
-from tempfile import NamedTemporaryFile
+from pathlib import Path
+from signal import SIGKILL
+from tempfile import gettempdir
 from time import sleep
 from unittest.mock import MagicMock
+from uuid import uuid4
 
 import pytest
 
@@ -18,18 +21,31 @@ from maxbot.user_locks.mp import (
 )
 
 
+def _create_streams():
+    # a unique name is enough, the socket file is created by the server;
+    # keep the path short, socket paths are limited to about 100 characters
+    return UnixSocketStreams(Path(gettempdir()) / f"maxbot-pytest-{uuid4().hex}.sock")
+
+
 @pytest.fixture
 def streams():
-    with NamedTemporaryFile(prefix="maxbot-pytest-", suffix="-.sock") as f:
-        path = f.name
-    return UnixSocketStreams(path)
+    return _create_streams()
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def spawn_ctx():
     return get_context("spawn")
 
 
+@pytest.fixture(scope="module")
+def server_streams(spawn_ctx):
+    # starting a server process is expensive, so the tests that do not configure the server
+    # share one; the server releases the locks of each client on disconnect
+    streams = _create_streams()
+    with server_process(streams, spawn_ctx):
+        yield streams
+
+
 @contextmanager
 def server_process(streams, spawn_ctx, args=tuple(), server_stop_=None):
     server_ready, server_stop = spawn_ctx.Event(), server_stop_ or spawn_ctx.Event()
@@ -53,86 +69,91 @@ async def mp_locks(open_connection):
     await locks.disconnect()
 
 
-def _common_client(open_connection, dialog, results):
+def _append(results, size, value):
+    with size.get_lock():
+        results[size.value] = value
+        size.value += 1
+
+
+def _common_client(open_connection, dialog, results, size):
     async def _impl():
         async with mp_locks(open_connection) as locks:
             for _ in range(4):
                 async with locks(dialog):
-                    results.append(1)
-                    results.append(2)
+                    _append(results, size, 1)
+                    _append(results, size, 2)
 
     asyncio.run(_impl())
 
 
-def test_concurrent_different_processes(streams, spawn_ctx):
+def test_concurrent_different_processes(server_streams, spawn_ctx):
     dialog = {"channel_name": "channel_test", "user_id": "user_test"}
-    results = spawn_ctx.Manager().list()
-
-    with server_process(streams, spawn_ctx):
-        proc_clients = []
-        for i in range(2):
-            proc_clients.append(
-                spawn_ctx.Process(
-                    target=_common_client,
-                    args=(streams.open_connection, dialog, results),
-                    name=f"Client {i}",
-                )
+    # shared memory is much cheaper than starting a manager process
+    results, size = spawn_ctx.Array("i", 16), spawn_ctx.Value("i", 0)
+
+    proc_clients = []
+    for i in range(2):
+        proc_clients.append(
+            spawn_ctx.Process(
+                target=_common_client,
+                args=(server_streams.open_connection, dialog, results, size),
+                name=f"Client {i}",
             )
+        )
 
-        for p in proc_clients:
-            p.start()
+    for p in proc_clients:
+        p.start()
 
-        for p in proc_clients:
-            p.join()
+    for p in proc_clients:
+        p.join()
 
+    assert size.value == 16
     assert results[:] == [1, 2] * 8
 
 
-async def test_concurrent_one_process(streams, spawn_ctx):
-    with server_process(streams, spawn_ctx):
-        async with mp_locks(streams.open_connection) as locks:
-            dialog = {"channel_name": "channel_test", "user_id": "user_test"}
+async def test_concurrent_one_process(server_streams):
+    async with mp_locks(server_streams.open_connection) as locks:
+        dialog = {"channel_name": "channel_test", "user_id": "user_test"}
 
-            results = []
+        results = []
 
-            async def _request(f1, f2, f3, f4):
-                async with locks(dialog):
-                    await f1
-                    results.append(1)
-                    await f2
-                    results.append(2)
-                async with locks(dialog):
-                    await f3
-                    results.append(1)
-                    await f4
-                    results.append(2)
-
-            fs = [asyncio.get_event_loop().create_future() for _ in range(12)]
-
-            async def _wake():
-                for f in fs:
-                    f.set_result(True)
-                    await asyncio.sleep(0.01)
-
-            await asyncio.gather(
-                asyncio.create_task(_request(fs[0], fs[3], fs[6], fs[9]), name="r1"),
-                asyncio.create_task(_request(fs[1], fs[4], fs[7], fs[10]), name="r2"),
-                asyncio.create_task(_request(fs[2], fs[5], fs[8], fs[11]), name="r3"),
-                asyncio.create_task(_wake(), name="wake"),
-            )
+        async def _request(f1, f2, f3, f4):
+            async with locks(dialog):
+                await f1
+                results.append(1)
+                await f2
+                results.append(2)
+            async with locks(dialog):
+                await f3
+                results.append(1)
+                await f4
+                results.append(2)
+
+        fs = [asyncio.get_event_loop().create_future() for _ in range(12)]
+
+        async def _wake():
+            for f in fs:
+                f.set_result(True)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(
+            asyncio.create_task(_request(fs[0], fs[3], fs[6], fs[9]), name="r1"),
+            asyncio.create_task(_request(fs[1], fs[4], fs[7], fs[10]), name="r2"),
+            asyncio.create_task(_request(fs[2], fs[5], fs[8], fs[11]), name="r3"),
+            asyncio.create_task(_wake(), name="wake"),
+        )
     assert results == [1, 2] * 6
 
 
-async def test_locked_exception(streams, spawn_ctx):
+async def test_locked_exception(server_streams):
     dialog = {"channel_name": "channel_test", "user_id": "user_test"}
-    with server_process(streams, spawn_ctx):
-        async with mp_locks(streams.open_connection) as locks:
-            with pytest.raises(RuntimeError):
-                async with locks(dialog):
-                    raise RuntimeError()
-
+    async with mp_locks(server_streams.open_connection) as locks:
+        with pytest.raises(RuntimeError):
             async with locks(dialog):
-                pass
+                raise RuntimeError()
+
+        async with locks(dialog):
+            pass
 
 
 def _locked_exit_client(open_connection, dialog, locked_event):
@@ -140,110 +161,106 @@ def _locked_exit_client(open_connection, dialog, locked_event):
         async with mp_locks(open_connection) as locks:
             async with locks(dialog):
                 locked_event.set()
-                Event().wait()
+                # hold the lock until the process is killed
+                await asyncio.get_running_loop().create_future()
 
     asyncio.run(_impl())
 
 
-async def test_locked_kill(streams, spawn_ctx):
-    with server_process(streams, spawn_ctx):
-        async with mp_locks(streams.open_connection) as locks:
-            dialog = {"channel_name": "channel_test", "user_id": "user_test"}
-
-            locked_event = spawn_ctx.Event()
-            p = spawn_ctx.Process(
-                target=_locked_exit_client,
-                args=(streams.open_connection, dialog, locked_event),
-                name="LockedExit",
-            )
-            p.start()
-            locked_event.wait()
-            p.kill()
-            p.join()
-
-            async with locks(dialog):
-                pass
+async def test_locked_kill(server_streams, spawn_ctx):
+    async with mp_locks(server_streams.open_connection) as locks:
+        dialog = {"channel_name": "channel_test", "user_id": "user_test"}
 
+        locked_event = spawn_ctx.Event()
+        p = spawn_ctx.Process(
+            target=_locked_exit_client,
+            args=(server_streams.open_connection, dialog, locked_event),
+            name="LockedExit",
+        )
+        p.start()
+        await asyncio.to_thread(locked_event.wait)
+        p.kill()
+        p.join()
+        assert p.exitcode == -SIGKILL
 
-async def test_recursive_lock(streams, spawn_ctx):
-    with server_process(streams, spawn_ctx):
-        try:
-            async with mp_locks(streams.open_connection) as locks:
-                locks._for_current_process = MagicMock()
-                dialog = {"channel_name": "channel_test", "user_id": "user_test"}
-                try:
-                    async with locks(dialog):
-                        with pytest.raises(ServerClosedConnectionError) as excinfo:
-                            async with locks(dialog):
-                                pass
-                except ServerClosedConnectionError:
-                    pass
-        except BrokenPipeError:
+        async with locks(dialog):
             pass
 
 
-async def test_brokenpipe2serverclosedconnectoin(streams, spawn_ctx):
-    with server_process(streams, spawn_ctx):
-        try:
-            async with mp_locks(streams.open_connection) as locks:
-                locks._for_current_process = MagicMock()
-                dialog = {"channel_name": "channel_test", "user_id": "user_test"}
-                try:
-                    async with locks(dialog):
-                        with pytest.raises(ServerClosedConnectionError) as excinfo:
-                            async with locks(dialog):
-                                pass
-                except ServerClosedConnectionError:
-                    pass
-                with pytest.raises(ServerClosedConnectionError) as excinfo:
-                    async with locks(dialog):
-                        pass
-        except BrokenPipeError:
-            pass
+async def test_recursive_lock(server_streams):
+    try:
+        async with mp_locks(server_streams.open_connection) as locks:
+            locks._for_current_process = MagicMock()
+            dialog = {"channel_name": "channel_test", "user_id": "user_test"}
+            try:
+                async with locks(dialog):
+                    with pytest.raises(ServerClosedConnectionError) as excinfo:
+                        async with locks(dialog):
+                            pass
+            except ServerClosedConnectionError:
+                pass
+    except BrokenPipeError:
+        pass
 
 
-async def test_is_not_locked(streams, spawn_ctx):
-    with server_process(streams, spawn_ctx):
-        try:
-            async with mp_locks(streams.open_connection) as locks:
-                dialog = {"channel_name": "channel_test", "user_id": "user_test"}
+async def test_brokenpipe2serverclosedconnectoin(server_streams):
+    try:
+        async with mp_locks(server_streams.open_connection) as locks:
+            locks._for_current_process = MagicMock()
+            dialog = {"channel_name": "channel_test", "user_id": "user_test"}
+            try:
+                async with locks(dialog):
+                    with pytest.raises(ServerClosedConnectionError) as excinfo:
+                        async with locks(dialog):
+                            pass
+            except ServerClosedConnectionError:
+                pass
+            with pytest.raises(ServerClosedConnectionError) as excinfo:
                 async with locks(dialog):
                     pass
+    except BrokenPipeError:
+        pass
 
-                await locks._release(b"")
 
-                with pytest.raises(ServerClosedConnectionError) as excinfo:
-                    async with locks(dialog):
-                        pass
-        except BrokenPipeError:
-            pass
+async def test_is_not_locked(server_streams):
+    try:
+        async with mp_locks(server_streams.open_connection) as locks:
+            dialog = {"channel_name": "channel_test", "user_id": "user_test"}
+            async with locks(dialog):
+                pass
 
+            await locks._release(b"")
 
-async def test_unexpected_op(streams, spawn_ctx):
-    with server_process(streams, spawn_ctx):
-        try:
-            async with mp_locks(streams.open_connection) as locks:
-                dialog = {"channel_name": "channel_test", "user_id": "user_test"}
+            with pytest.raises(ServerClosedConnectionError) as excinfo:
                 async with locks(dialog):
                     pass
-
-                locks._writer.write(b"?" + _EOF)
-                await locks._writer.drain()
-
-                with pytest.raises(ServerClosedConnectionError) as excinfo:
-                    async with locks(dialog):
-                        pass
-        except BrokenPipeError:
-            pass
+    except BrokenPipeError:
+        pass
 
 
-async def test_different_user(streams, spawn_ctx):
-    with server_process(streams, spawn_ctx):
-        async with mp_locks(streams.open_connection) as locks:
+async def test_unexpected_op(server_streams):
+    try:
+        async with mp_locks(server_streams.open_connection) as locks:
             dialog = {"channel_name": "channel_test", "user_id": "user_test"}
             async with locks(dialog):
-                async with locks({**dialog, **{"user_id": "2"}}):
+                pass
+
+            locks._writer.write(b"?" + _EOF)
+            await locks._writer.drain()
+
+            with pytest.raises(ServerClosedConnectionError) as excinfo:
+                async with locks(dialog):
                     pass
+    except BrokenPipeError:
+        pass
+
+
+async def test_different_user(server_streams):
+    async with mp_locks(server_streams.open_connection) as locks:
+        dialog = {"channel_name": "channel_test", "user_id": "user_test"}
+        async with locks(dialog):
+            async with locks({**dialog, **{"user_id": "2"}}):
+                pass
 
 
 def patch_ACQ_ACQUIRED():